@@ -0,0 +1,93 @@
+"""Auth overhead of widget requests with and without the token blacklist filter.
+
+The token cache is disabled so that every request verifies its token, and the
+blacklist is filled with REVOKED rows before timing GET /widgets/<name>.
+
+Usage: python benchmarks/bench_blacklist_filter.py [--revoked N] [--requests N]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from flask_api import blacklist_filter, create_app, db, token_cache
+from flask_api.models.token_blacklist import BlacklistedToken
+from flask_api.models.user import User
+from flask_api.models.widget import Widget
+
+
+def fill_blacklist(revoked):
+    expires_at = datetime.utcnow() + timedelta(hours=1)
+    table = BlacklistedToken.__table__
+    for start in range(0, revoked, 10000):
+        rows = [
+            dict(token_digest=BlacklistedToken.digest(f"{i}"), expires_at=expires_at)
+            for i in range(start, min(start + 10000, revoked))
+        ]
+        db.session.execute(table.insert(), rows)
+    db.session.commit()
+
+
+def time_requests(client, url, headers, count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.data
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def time_check_blacklist(token, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        BlacklistedToken.check_blacklist(token)
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--revoked", type=int, default=100000)
+    arg_parser.add_argument("--requests", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = create_app("development")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_file}"
+
+    with app.app_context():
+        db.create_all()
+        admin = User(email="bench@email.com", password="bench1234", admin=True)
+        db.session.add(admin)
+        db.session.commit()
+        deadline = datetime.utcnow() + timedelta(days=3)
+        widget = Widget(name="bench", info_url="https://a.b", deadline=deadline)
+        widget.owner_id = admin.id
+        db.session.add(widget)
+        db.session.commit()
+        fill_blacklist(args.revoked)
+        access_token = admin.encode_access_token().decode()
+
+        token_cache.configure(maxsize=0, ttl=0)
+        headers = {"Authorization": f"Bearer {access_token}"}
+        client = app.test_client()
+        url = "/api/v1/widgets/bench"
+        print(f"{args.revoked} blacklisted tokens, {args.requests} requests")
+        for enabled in (False, True):
+            blacklist_filter.enabled = enabled
+            BlacklistedToken.rebuild_filter()
+            time_requests(client, url, headers, 50)
+            mean, p99 = time_requests(client, url, headers, args.requests)
+            check = time_check_blacklist(access_token, args.requests)
+            label = "filter on " if enabled else "filter off"
+            print(
+                f"{label}: GET mean {mean * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms, "
+                f"check_blacklist {check * 1e6:.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Index size and lookup latency of token_blacklist: full JWT vs SHA-256 digest.
+
+Builds two sqlite tables with ROWS revoked tokens each, one keyed on the full
+token (String(500), the previous schema) and one keyed on token_digest.
+
+Usage: python benchmarks/bench_blacklist_index.py [--rows N] [--lookups N]
+"""
+import argparse
+import os
+import random
+import secrets
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+from sqlalchemy import bindparam, create_engine, text
+
+from flask_api.models.token_blacklist import BlacklistedToken
+
+# A token issued by User.encode_access_token is about this long.
+TOKEN_LENGTH = 220
+
+
+def make_token():
+    return secrets.token_urlsafe(TOKEN_LENGTH)[:TOKEN_LENGTH]
+
+
+def build_table(engine, name, key_column, keys):
+    metadata = MetaData()
+    table = Table(
+        name,
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        key_column,
+        Column("blacklisted_on", DateTime),
+        Column("expires_at", DateTime, nullable=False, index=True),
+    )
+    metadata.create_all(engine)
+    now = datetime.utcnow()
+    rows = [
+        {key_column.name: key, "blacklisted_on": now, "expires_at": now + timedelta(1)}
+        for key in keys
+    ]
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 50000):
+            conn.execute(table.insert(), rows[start : start + 50000])
+    return table
+
+
+def index_size(engine, table_name):
+    query = text(
+        "SELECT sum(pgsize) FROM dbstat WHERE name IN "
+        "(SELECT name FROM sqlite_master WHERE tbl_name = :name AND type = 'index' "
+        "AND sql IS NULL)"
+    )
+    with engine.connect() as conn:
+        return conn.execute(query, dict(name=table_name)).scalar()
+
+
+def time_lookups(engine, table, column, keys):
+    query = table.select().where(column == bindparam("key"))
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for key in keys:
+            conn.execute(query, dict(key=key)).first()
+    return (time.perf_counter() - start) / len(keys)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=1000000)
+    arg_parser.add_argument("--lookups", type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_file}")
+    tokens = [make_token() for _ in range(args.rows)]
+    probes = random.sample(tokens, args.lookups // 2) + [
+        make_token() for _ in range(args.lookups // 2)
+    ]
+
+    legacy = build_table(
+        engine, "legacy", Column("token", String(500), unique=True), tokens
+    )
+    digests = build_table(
+        engine,
+        "digest",
+        Column("token_digest", String(64), unique=True),
+        (BlacklistedToken.digest(token) for token in tokens),
+    )
+
+    print(f"{args.rows} revoked tokens, {args.lookups} lookups (half of them hits)")
+    legacy_time = time_lookups(engine, legacy, legacy.c.token, probes)
+    start = time.perf_counter()
+    probe_digests = [BlacklistedToken.digest(token) for token in probes]
+    digest_cost = (time.perf_counter() - start) / len(probes)
+    digest_time = time_lookups(engine, digests, digests.c.token_digest, probe_digests)
+    for label, table, lookup in (
+        ("token        ", "legacy", legacy_time),
+        ("token_digest ", "digest", digest_time + digest_cost),
+    ):
+        size_mb = index_size(engine, table) / 2**20
+        print(f"{label}: unique index {size_mb:.1f} MiB, lookup {lookup * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
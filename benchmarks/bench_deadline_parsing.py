@@ -0,0 +1,64 @@
+"""Deadline parsing time: dateutil.parser vs the ISO 8601 fast path (iso_date).
+
+Strings are distinct dates, half YYYY-MM-DD and half full ISO 8601 datetimes.
+future_date_from_string is also timed inside one request, where repeated
+strings (like the deadlines of a batch) are memoized.
+
+Usage: python benchmarks/bench_deadline_parsing.py [--strings N]
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from dateutil import parser
+
+from flask_api import create_app
+from flask_api.api.widgets.dto import future_date_from_string, iso_date
+
+
+def make_strings(count):
+    start = date.today() + timedelta(days=1)
+    strings = []
+    for i in range(count):
+        day = start + timedelta(days=i % 3650)
+        if i % 2:
+            strings.append(f"{day.isoformat()}T{i % 24:02}:30:00+02:00")
+        else:
+            strings.append(day.isoformat())
+    return strings
+
+
+def time_calls(func, strings):
+    start = time.perf_counter()
+    for date_str in strings:
+        func(date_str)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--strings", type=int, default=100000)
+    args = arg_parser.parse_args()
+
+    strings = make_strings(args.strings)
+    assert all(iso_date(s) == parser.parse(s).date() for s in strings[:1000])
+    print(f"{args.strings} strings")
+    for label, func in (
+        ("dateutil.parser.parse", parser.parse),
+        ("iso_date             ", iso_date),
+    ):
+        elapsed = time_calls(func, strings)
+        print(f"{label}: {elapsed:.3f} s, {elapsed / len(strings) * 1e6:.2f} us each")
+
+    app = create_app("development")
+    with app.test_request_context():
+        elapsed = time_calls(future_date_from_string, strings)
+    per_string = elapsed / len(strings) * 1e6
+    print(
+        f"future_date_from_string, one request: {elapsed:.3f} s, "
+        f"{per_string:.2f} us each"
+    )
+
+
+if __name__ == "__main__":
+    main()
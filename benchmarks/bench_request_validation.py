@@ -0,0 +1,56 @@
+"""Parse and validate cost of POST /widgets bodies: RequestParser vs compiled validator.
+
+Each iteration builds a fresh request (so form and JSON bodies are parsed
+again), the cost of building an empty request is measured and subtracted.
+
+Usage: python benchmarks/bench_request_validation.py [--requests N]
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from flask_api import create_app
+from flask_api.api.auth.dto import auth_reqparser, auth_validator
+from flask_api.api.widgets.dto import create_widget_reqparser, create_widget_validator
+
+
+def time_parse(app, parse, count, **request_args):
+    start = time.perf_counter()
+    for _ in range(count):
+        with app.test_request_context(method="POST", **request_args):
+            parse()
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--requests", type=int, default=5000)
+    args = arg_parser.parse_args()
+
+    app = create_app("development")
+    deadline = (date.today() + timedelta(days=3)).isoformat()
+    bodies = {
+        "auth": dict(email="bench@email.com", password="bench1234"),
+        "widget": dict(
+            name="bench", info_url="https://www.fakesite.com", deadline=deadline
+        ),
+    }
+    parsers = {
+        "auth": (auth_reqparser.parse_args, auth_validator),
+        "widget": (create_widget_reqparser.parse_args, create_widget_validator),
+    }
+    baseline = time_parse(app, lambda: None, args.requests, data=bodies["auth"])
+    print(f"{args.requests} requests, request context alone: {baseline * 1e6:.1f} us")
+    for name, (parse_args, validator) in parsers.items():
+        body = bodies[name]
+        timings = [
+            ("reqparser form", time_parse(app, parse_args, args.requests, data=body)),
+            ("compiled form ", time_parse(app, validator, args.requests, data=body)),
+            ("compiled json ", time_parse(app, validator, args.requests, json=body)),
+        ]
+        for label, timing in timings:
+            print(f"{name:6} {label}: {(timing - baseline) * 1e6:.1f} us per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Serialization time of a widget list page with marshal and with compiled models.
+
+Widgets are loaded once, then the same page is serialized repeatedly with
+flask_restx.marshal(pagination_model) and with pagination_serializer.
+
+Usage: python benchmarks/bench_serializer.py [--per-page N] [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from flask_restx import marshal
+
+from flask_api import create_app, db
+from flask_api.api.widgets.business import _Pagination, _widget_query
+from flask_api.api.widgets.dto import pagination_model, pagination_serializer
+from flask_api.models.user import User
+from flask_api.models.widget import Widget
+
+
+def create_widgets(owner, count):
+    deadline = datetime.utcnow() + timedelta(days=3)
+    for i in range(count):
+        widget = Widget(name=f"bench{i}", info_url="https://a.b", deadline=deadline)
+        widget.owner_id = owner.id
+        db.session.add(widget)
+    db.session.commit()
+
+
+def time_serialize(serialize, pagination, count):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        serialize(pagination)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--per-page", type=int, default=100)
+    arg_parser.add_argument("--repeat", type=int, default=500)
+    args = arg_parser.parse_args()
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = create_app("development")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_file}"
+
+    with app.app_context(), app.test_request_context("/api/v1/widgets"):
+        db.create_all()
+        owner = User(email="bench@email.com", password="bench1234")
+        db.session.add(owner)
+        db.session.commit()
+        create_widgets(owner, args.per_page)
+        items = _widget_query().limit(args.per_page).all()
+        pagination = _Pagination(1, args.per_page, len(items), items, False)
+        assert pagination_serializer(pagination) == marshal(pagination, pagination_model)
+
+        print(f"{args.per_page} widgets per page, {args.repeat} repeats")
+        for label, serialize in (
+            ("marshal ", lambda page: marshal(page, pagination_model)),
+            ("compiled", pagination_serializer),
+        ):
+            time_serialize(serialize, pagination, 20)
+            mean, p99 = time_serialize(serialize, pagination, args.repeat)
+            print(f"{label}: mean {mean * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
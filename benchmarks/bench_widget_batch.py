@@ -0,0 +1,78 @@
+"""Time to create widgets one POST /widgets at a time and with /widgets/batch/create.
+
+Usage: python benchmarks/bench_widget_batch.py [--widgets N] [--single N]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from flask_api import create_app, db
+from flask_api.models.user import User
+from flask_api.models.widget import Widget
+
+
+def create_one_by_one(client, headers, names, deadline):
+    for name in names:
+        response = client.post(
+            "/api/v1/widgets",
+            headers=headers,
+            data=dict(name=name, info_url="https://www.fakesite.com", deadline=deadline),
+        )
+        assert response.status_code == 201, response.data
+
+
+def create_batch(client, headers, names, deadline):
+    widgets = [
+        dict(name=name, info_url="https://www.fakesite.com", deadline=deadline)
+        for name in names
+    ]
+    response = client.post(
+        "/api/v1/widgets/batch/create", headers=headers, json=dict(widgets=widgets)
+    )
+    assert response.status_code == 200, response.data
+    assert response.json["status"] == "success", response.json["message"]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--widgets", type=int, default=10000)
+    arg_parser.add_argument("--single", type=int, default=500)
+    args = arg_parser.parse_args()
+
+    db_file = os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = create_app("development")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_file}"
+
+    with app.app_context():
+        db.create_all()
+        admin = User(email="bench@email.com", password="bench1234", admin=True)
+        db.session.add(admin)
+        db.session.commit()
+        access_token = admin.encode_access_token().decode()
+        headers = {"Authorization": f"Bearer {access_token}"}
+        deadline = (date.today() + timedelta(days=3)).isoformat()
+        client = app.test_client()
+
+        names = [f"single{i}" for i in range(args.single)]
+        start = time.perf_counter()
+        create_one_by_one(client, headers, names, deadline)
+        single = (time.perf_counter() - start) / args.single
+
+        names = [f"batch{i}" for i in range(args.widgets)]
+        start = time.perf_counter()
+        create_batch(client, headers, names, deadline)
+        batch = time.perf_counter() - start
+        assert Widget.query.count() == args.single + args.widgets
+
+        print(f"one by one: {single * 1000:.3f} ms per widget")
+        print(
+            f"batch: {args.widgets} widgets in {batch:.2f} s, "
+            f"{batch / args.widgets * 1000:.3f} ms per widget "
+            f"(one by one: ~{single * args.widgets:.1f} s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
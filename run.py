@@ -1,12 +1,15 @@
 """Flask CLI/Application entry point."""
 import os
+import time
 
 import click
 
-from flask_api import create_app, db
+from flask_api import bcrypt, create_app, db
+from flask_api.models.refresh_token import RefreshToken
 from flask_api.models.token_blacklist import BlacklistedToken
 from flask_api.models.user import User
 from flask_api.models.widget import Widget
+from flask_api.util.hash_pool import HashPoolSaturated
 
 
 app = create_app(os.getenv("FLASK_ENV", "development"))
@@ -21,6 +24,7 @@ def shell():
         "db": db,
         "User": User,
         "BlacklistedToken": BlacklistedToken,
+        "RefreshToken": RefreshToken,
         "Widget": Widget,
     }
 
@@ -38,7 +42,12 @@ def add_user(email, admin, password):
         click.secho(f"{error}\n", fg="red", bold=True)
         return 1
 
-    new_user = User(email=email, password=password, admin=admin)
+    try:
+        new_user = User(email=email, password=password, admin=admin)
+    except HashPoolSaturated as e:
+        click.secho(f"Error: {e}\n", fg="red", bold=True)
+        return 1
+
     db.session.add(new_user)
     db.session.commit()
     user_type = "admin user" if admin else "user"
@@ -47,5 +56,84 @@ def add_user(email, admin, password):
     return 0
 
 
+@app.cli.command("revoke-tokens", short_help="log a user out everywhere")
+@click.argument("email")
+def revoke_tokens(email):
+    """Revoke every access and refresh token of the user with email address = EMAIL."""
+    user = User.find_by_email(email)
+    if not user:
+        error = f"Error: {email} is not registered"
+        click.secho(f"{error}\n", fg="red", bold=True)
+        return 1
+
+    user.revoke_all_tokens()
+    db.session.commit()
+    token_version_cache_ttl = app.config.get("TOKEN_VERSION_CACHE_TTL")
+    message = (
+        f"Revoked all tokens of {email}, running workers reject them "
+        f"within {token_version_cache_ttl} seconds"
+    )
+    click.secho(message, fg="blue", bold=True)
+    return 0
+
+
+@app.cli.command("purge-blacklist", short_help="delete expired tokens")
+@click.option(
+    "--batch-size",
+    default=1000,
+    show_default=True,
+    help="Number of rows deleted per transaction",
+)
+def purge_blacklist(batch_size):
+    """Delete expired blacklisted and refresh tokens, BATCH_SIZE rows at a time."""
+    for label, model in (("blacklisted", BlacklistedToken), ("refresh", RefreshToken)):
+        result = model.purge_expired(batch_size)
+        message = (
+            f"Removed {result.deleted} expired {label} tokens "
+            f"in {result.elapsed:.3f} seconds"
+        )
+        click.secho(message, fg="blue", bold=True)
+    return 0
+
+
+@app.cli.command("bcrypt-calibrate", short_help="recommend a BCRYPT_LOG_ROUNDS value")
+@click.option(
+    "--target-ms",
+    default=250,
+    show_default=True,
+    help="Longest acceptable time to hash one password",
+)
+@click.option(
+    "--samples", default=3, show_default=True, help="Hashes timed per cost factor"
+)
+def bcrypt_calibrate(target_ms, samples):
+    """Time bcrypt on this machine and recommend the highest cost within TARGET_MS."""
+    recommended = None
+    for log_rounds in range(4, 32):
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            bcrypt.generate_password_hash("calibration password", log_rounds)
+            timings.append((time.perf_counter() - start) * 1000)
+        elapsed_ms = min(timings)
+        click.echo(f"BCRYPT_LOG_ROUNDS = {log_rounds:2d}: {elapsed_ms:9.1f} ms")
+        if elapsed_ms > target_ms:
+            break
+        recommended = log_rounds
+
+    if not recommended:
+        error = f"Error: no cost factor hashes within {target_ms} ms"
+        click.secho(f"{error}\n", fg="red", bold=True)
+        return 1
+
+    current = app.config.get("BCRYPT_LOG_ROUNDS")
+    message = (
+        f"Recommended BCRYPT_LOG_ROUNDS = {recommended} (configured: {current}). "
+        "Existing password hashes are updated on the next login of each user."
+    )
+    click.secho(message, fg="blue", bold=True)
+    return 0
+
+
 if __name__ == "__main__":
     app.run()
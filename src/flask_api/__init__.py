@@ -7,11 +7,33 @@ from flask_sqlalchemy import SQLAlchemy
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 from flask_api.config import get_config
+from flask_api.util.bloom_filter import SyncedBloomFilter
+from flask_api.util.cache import TTLCache
+from flask_api.util.compression import Compression
+from flask_api.util.hash_pool import HashPool
+from flask_api.util.json_provider import JSONProvider
+from flask_api.util.periodic import run_periodically
 
 cors = CORS()
 db = SQLAlchemy()
 migrate = Migrate()
 bcrypt = Bcrypt()
+# gzip for large responses, see Config.COMPRESS_*
+compression = Compression()
+# Encodes JSON response bodies (see also: api.output_json)
+json_provider = JSONProvider()
+# Runs bcrypt off the request thread (see User.password and User.check_password)
+hash_pool = HashPool()
+# Verified access token payloads, keyed by token (see User.decode_access_token)
+token_cache = TTLCache()
+# Current User.token_version, keyed by public_id
+token_version_cache = TTLCache()
+# Tokens in the token_blacklist table (see BlacklistedToken.check_blacklist)
+blacklist_filter = SyncedBloomFilter()
+# Total number of widgets for paginated lists (see retrieve_widget_list)
+widget_count_cache = TTLCache()
+# Widget GET response bodies, keyed by the parsed request arguments
+widget_response_cache = TTLCache()
 
 
 def create_app(config_name):
@@ -29,4 +51,48 @@ def create_app(config_name):
     db.init_app(app)
     migrate.init_app(app, db)
     bcrypt.init_app(app)
+    compression.init_app(app)
+    json_provider.configure(
+        encoder=app.config.get("JSON_PROVIDER"),
+        sort_keys=app.config.get("JSON_SORT_KEYS"),
+    )
+    hash_pool.configure(
+        pool_type=app.config.get("BCRYPT_POOL_TYPE"),
+        size=app.config.get("BCRYPT_POOL_SIZE"),
+        queue_limit=app.config.get("BCRYPT_POOL_QUEUE_LIMIT"),
+        timeout=app.config.get("BCRYPT_POOL_TIMEOUT"),
+    )
+    token_cache.configure(
+        maxsize=app.config.get("TOKEN_CACHE_MAXSIZE"),
+        ttl=app.config.get("TOKEN_CACHE_TTL"),
+    )
+    token_version_cache.configure(
+        maxsize=app.config.get("TOKEN_VERSION_CACHE_MAXSIZE"),
+        ttl=app.config.get("TOKEN_VERSION_CACHE_TTL"),
+    )
+    widget_count_cache.configure(
+        maxsize=app.config.get("WIDGET_COUNT_CACHE_MAXSIZE"),
+        ttl=app.config.get("WIDGET_COUNT_CACHE_TTL"),
+    )
+    widget_response_cache.configure(
+        maxsize=app.config.get("WIDGET_RESPONSE_CACHE_MAXSIZE"),
+        ttl=app.config.get("WIDGET_RESPONSE_CACHE_TTL"),
+        maxbytes=app.config.get("WIDGET_RESPONSE_CACHE_MAXBYTES"),
+    )
+    blacklist_filter.configure(
+        enabled=app.config.get("BLACKLIST_FILTER_ENABLED"),
+        capacity=app.config.get("BLACKLIST_FILTER_CAPACITY"),
+        error_rate=app.config.get("BLACKLIST_FILTER_ERROR_RATE"),
+        refresh_interval=app.config.get("BLACKLIST_FILTER_REFRESH"),
+    )
+
+    purge_interval = app.config.get("BLACKLIST_PURGE_INTERVAL")
+    if purge_interval:
+        from flask_api.models.refresh_token import RefreshToken
+        from flask_api.models.token_blacklist import BlacklistedToken
+
+        batch_size = app.config.get("BLACKLIST_PURGE_BATCH_SIZE")
+        for model in (BlacklistedToken, RefreshToken):
+            run_periodically(app, purge_interval, model.purge_expired, batch_size)
+
     return app
@@ -1,9 +1,14 @@
 """API blueprint configuration."""
+from http import HTTPStatus
+
 from flask import Blueprint
 from flask_restx import Api
 
+from flask_api import json_provider
 from flask_api.api.auth.endpoints import auth_ns
+from flask_api.api.metrics.endpoints import metrics_ns
 from flask_api.api.widgets.endpoints import widget_ns
+from flask_api.util.hash_pool import HashPoolSaturated
 
 
 api_bp = Blueprint("api", __name__, url_prefix="/api/v1")
@@ -20,3 +25,16 @@ api = Api(
 
 api.add_namespace(auth_ns, path="/auth")
 api.add_namespace(widget_ns, path="/widgets")
+api.add_namespace(metrics_ns, path="/metrics")
+
+
+@api.representation("application/json")
+def output_json(data, code, headers=None):
+    return json_provider.output_json(data, code, headers)
+
+
+@api.errorhandler(HashPoolSaturated)
+def handle_hash_pool_saturated(error):
+    """Fail fast with 503 when every password hashing worker is busy."""
+    response_dict = dict(status="fail", message=str(error))
+    return response_dict, HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": "1"}
@@ -1,13 +1,22 @@
 """Business logic for /auth API endpoints."""
 from http import HTTPStatus
 
-from flask import current_app, jsonify
+from flask import current_app, g
 from flask_restx import abort
+from sqlalchemy.exc import IntegrityError
 
-from flask_api import db
+from flask_api import (
+    db,
+    blacklist_filter,
+    json_provider,
+    token_cache,
+    token_version_cache,
+)
 from flask_api.api.auth.decorators import token_required
+from flask_api.models.refresh_token import RefreshToken
 from flask_api.models.token_blacklist import BlacklistedToken
 from flask_api.models.user import User
+from flask_api.util.db_util import is_unique_violation
 from flask_api.util.datetime_util import (
     remaining_fromtimestamp,
     format_timespan_digits,
@@ -15,16 +24,24 @@ from flask_api.util.datetime_util import (
 
 
 def process_registration_request(email, password):
-    if User.find_by_email(email):
-        abort(HTTPStatus.CONFLICT, f"{email} is already registered", status="fail")
     new_user = User(email=email, password=password)
     db.session.add(new_user)
-    db.session.commit()
+    # The unique constraint on email detects duplicates, even concurrent ones.
+    try:
+        db.session.flush()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not is_unique_violation(e, User.__table__.c.email):
+            raise
+        abort(HTTPStatus.CONFLICT, f"{email} is already registered", status="fail")
     access_token = new_user.encode_access_token()
+    refresh_token = RefreshToken.issue(new_user)
+    db.session.commit()
     return _create_auth_successful_response(
         token=access_token.decode(),
         status_code=HTTPStatus.CREATED,
         message="successfully registered",
+        refresh_token=refresh_token,
     )
 
 
@@ -33,10 +50,39 @@ def process_login_request(email, password):
     if not user or not user.check_password(password):
         abort(HTTPStatus.UNAUTHORIZED, "email or password does not match", status="fail")
     access_token = user.encode_access_token()
+    if user.needs_rehash():
+        user.rehash_password(password)
+    refresh_token = RefreshToken.issue(user)
+    db.session.commit()
     return _create_auth_successful_response(
         token=access_token.decode(),
         status_code=HTTPStatus.OK,
         message="successfully logged in",
+        refresh_token=refresh_token,
+    )
+
+
+def process_refresh_request(refresh_token):
+    stored_token = RefreshToken.find_by_token(refresh_token)
+    if not stored_token or stored_token.expired:
+        abort(HTTPStatus.UNAUTHORIZED, "refresh token invalid or expired", status="fail")
+
+    if not stored_token.revoke():
+        # Refresh tokens are single use, a second use means it was leaked.
+        RefreshToken.revoke_all(stored_token.user_id)
+        db.session.commit()
+        error = "refresh token already used, please log in again"
+        abort(HTTPStatus.UNAUTHORIZED, error, status="fail")
+
+    user = stored_token.user
+    access_token = user.encode_access_token()
+    new_refresh_token = RefreshToken.issue(user)
+    db.session.commit()
+    return _create_auth_successful_response(
+        token=access_token.decode(),
+        status_code=HTTPStatus.OK,
+        message="successfully refreshed",
+        refresh_token=new_refresh_token,
     )
 
 
@@ -44,32 +90,52 @@ def process_login_request(email, password):
 # https://aaronluna.dev/series/flask-api-tutorial/part-4/#get_logged_in_user-function
 @token_required
 def get_logged_in_user():
-    public_id = get_logged_in_user.public_id
+    public_id = g.token_payload.public_id
     user = User.find_by_public_id(public_id)
-    expires_at = get_logged_in_user.expires_at
+    expires_at = g.token_payload.expires_at
     user.token_expires_in = format_timespan_digits(remaining_fromtimestamp(expires_at))
     return user
 
 
 @token_required
-def process_logout_request():
-    access_token = process_logout_request.token
-    expires_at = process_logout_request.expires_at
+def process_logout_request(refresh_token=None):
+    access_token = g.token_payload.token
+    expires_at = g.token_payload.expires_at
     blacklisted_token = BlacklistedToken(access_token, expires_at)
     db.session.add(blacklisted_token)
+    if refresh_token:
+        stored_token = RefreshToken.find_by_token(refresh_token)
+        if stored_token and stored_token.user.public_id == g.token_payload.public_id:
+            stored_token.revoke()
     db.session.commit()
+    token_cache.pop(access_token)
+    blacklist_filter.add(blacklisted_token.token_digest)
     response_dict = dict(status="success", message="successfully logged out")
     return response_dict, HTTPStatus.OK
 
 
-def _create_auth_successful_response(token, status_code, message):
-    response = jsonify(
+@token_required
+def process_logout_all_request():
+    user = User.find_by_public_id(g.token_payload.public_id)
+    user.revoke_all_tokens()
+    db.session.commit()
+    token_version_cache.pop(user.public_id)
+    response_dict = dict(status="success", message="successfully logged out everywhere")
+    return response_dict, HTTPStatus.OK
+
+
+def _create_auth_successful_response(token, status_code, message, refresh_token=None):
+    response_dict = dict(
         status="success",
         message=message,
         access_token=token,
         token_type="bearer",
         expires_in=_get_token_expire_time(),
     )
+    if refresh_token:
+        response_dict["refresh_token"] = refresh_token
+        response_dict["refresh_expires_in"] = _get_refresh_token_expire_time()
+    response = json_provider.jsonify(response_dict)
     response.status_code = status_code
     response.headers["Cache-Control"] = "no-store"
     response.headers["Pragma"] = "no-cache"
@@ -81,3 +147,7 @@ def _get_token_expire_time():
     token_age_m = current_app.config.get("TOKEN_EXPIRE_MINUTES")
     expires_in_seconds = token_age_h * 3600 + token_age_m * 60
     return expires_in_seconds if not current_app.config["TESTING"] else 5
+
+
+def _get_refresh_token_expire_time():
+    return current_app.config.get("REFRESH_TOKEN_EXPIRE_DAYS") * 86400
@@ -1,11 +1,16 @@
 """Decorators that decode and verify authorization tokens."""
+from collections import namedtuple
 from functools import wraps
 
-from flask import request
+from flask import g, request
 
 from flask_api.api.exceptions import ApiUnauthorized, ApiForbidden
 from flask_api.models.user import User
 
+# Claims of the access token sent with the current request, stored on flask.g
+# (one per request, not shared between concurrent greenlets).
+TokenPayload = namedtuple("TokenPayload", ["public_id", "admin", "token", "expires_at"])
+
 
 def token_required(f):
     """
@@ -15,11 +20,7 @@ def token_required(f):
 
     @wraps(f)
     def decorated(*args, **kwargs):
-        token_payload = _check_access_token(admin_only=False)
-
-        for name, val in token_payload.items():
-            setattr(decorated, name, val)
-
+        g.token_payload = _check_access_token(admin_only=False)
         return f(*args, **kwargs)
 
     return decorated
@@ -34,12 +35,10 @@ def admin_token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         token_payload = _check_access_token(admin_only=True)
-        if not token_payload["admin"]:
+        if not token_payload.admin:
             raise ApiForbidden()
 
-        for name, val in token_payload.items():
-            setattr(decorated, name, val)
-
+        g.token_payload = token_payload
         return f(*args, **kwargs)
 
     return decorated
@@ -60,4 +59,4 @@ def _check_access_token(admin_only):
             error_description=result.error,
         )
 
-    return result.value
+    return TokenPayload(**result.value)
@@ -4,6 +4,9 @@ from flask_restx.fields import String, Boolean
 from flask_restx.inputs import email
 from flask_restx.reqparse import RequestParser
 
+from flask_api.util.serializer import compile_model
+from flask_api.util.validator import compile_parser
+
 
 # Bundle: Report all error instead of the first.
 auth_reqparser = RequestParser(bundle_errors=True)
@@ -13,6 +16,18 @@ auth_reqparser.add_argument(
 auth_reqparser.add_argument(
     name="password", type=str, location="form", required=True, nullable=False
 )
+# Validates a JSON or form body with the arguments of auth_reqparser.
+auth_validator = compile_parser(auth_reqparser)
+
+refresh_reqparser = RequestParser(bundle_errors=True)
+refresh_reqparser.add_argument(
+    name="refresh_token", type=str, location="form", required=True, nullable=False
+)
+
+logout_reqparser = RequestParser(bundle_errors=True)
+logout_reqparser.add_argument(
+    name="refresh_token", type=str, location="form", required=False, nullable=False
+)
 """
 "User" is the name of the API Model, and this value will be used to identify
 the JSON object in the Swagger UI page. Please read the Flask-RESTx documentation
@@ -38,3 +53,4 @@ user_model = Model(
         "token_expires_in": String,
     },
 )
+user_serializer = compile_model(user_model)
@@ -3,11 +3,20 @@ from http import HTTPStatus
 
 from flask_restx import Namespace, Resource
 
-from flask_api.api.auth.dto import auth_reqparser, user_model
+from flask_api.api.auth.dto import (
+    auth_reqparser,
+    auth_validator,
+    logout_reqparser,
+    refresh_reqparser,
+    user_model,
+    user_serializer,
+)
 from flask_api.api.auth.business import (
     process_registration_request,
     process_logout_request,
+    process_logout_all_request,
     process_login_request,
+    process_refresh_request,
     get_logged_in_user,
 )
 
@@ -30,7 +39,7 @@ class RegisterUser(Resource):
     @auth_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
     def post(self):
         """Register a new user and return an access token."""
-        request_data = auth_reqparser.parse_args()
+        request_data = auth_validator()
         email = request_data.get("email")
         password = request_data.get("password")
         return process_registration_request(email, password)
@@ -47,12 +56,28 @@ class LoginUser(Resource):
     @auth_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
     def post(self):
         """Authenticate an existing user and return an access token."""
-        request_data = auth_reqparser.parse_args()
+        request_data = auth_validator()
         email = request_data.get("email")
         password = request_data.get("password")
         return process_login_request(email, password)
 
 
+@auth_ns.route("/refresh", endpoint="auth_refresh")
+class RefreshAccessToken(Resource):
+    """Handles HTTP requests to URL: /api/v1/auth/refresh."""
+
+    @auth_ns.expect(refresh_reqparser)
+    @auth_ns.response(int(HTTPStatus.OK), "New access and refresh tokens issued.")
+    @auth_ns.response(int(HTTPStatus.UNAUTHORIZED), "Refresh token is invalid or used.")
+    @auth_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+    @auth_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+    def post(self):
+        """Exchange a refresh token for a new access token and refresh token."""
+        request_data = refresh_reqparser.parse_args()
+        refresh_token = request_data.get("refresh_token")
+        return process_refresh_request(refresh_token)
+
+
 @auth_ns.route("/user", endpoint="auth_user")
 class GetUser(Resource):
     """Handles HTTP requests to URL: /api/v1/auth/user."""
@@ -61,11 +86,10 @@ class GetUser(Resource):
     @auth_ns.response(int(HTTPStatus.OK), "Token is currently valid.", user_model)
     @auth_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
     @auth_ns.response(int(HTTPStatus.UNAUTHORIZED), "Token is invalid or expired.")
-    @auth_ns.marshal_with(user_model)
     def get(self):
         """Validate access token and return user info."""
         # https://aaronluna.dev/series/flask-api-tutorial/part-4/#getuser-resource
-        return get_logged_in_user()
+        return user_serializer(get_logged_in_user())
 
 
 @auth_ns.route("/logout", endpoint="auth_logout")
@@ -73,10 +97,26 @@ class LogoutUser(Resource):
     """Handles HTTP requests to URL: /auth/logout."""
 
     @auth_ns.doc(security="Bearer")
+    @auth_ns.expect(logout_reqparser)
     @auth_ns.response(int(HTTPStatus.OK), "Log out succeeded, token is no longer valid.")
     @auth_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
     @auth_ns.response(int(HTTPStatus.UNAUTHORIZED), "Token is invalid or expired.")
     @auth_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
     def post(self):
         """Add token to blacklist, deauthenticating the current user."""
-        return process_logout_request()
+        request_data = logout_reqparser.parse_args()
+        refresh_token = request_data.get("refresh_token")
+        return process_logout_request(refresh_token)
+
+
+@auth_ns.route("/logout/all", endpoint="auth_logout_all")
+class LogoutAllSessions(Resource):
+    """Handles HTTP requests to URL: /auth/logout/all."""
+
+    @auth_ns.doc(security="Bearer")
+    @auth_ns.response(int(HTTPStatus.OK), "Every token of the user is no longer valid.")
+    @auth_ns.response(int(HTTPStatus.UNAUTHORIZED), "Token is invalid or expired.")
+    @auth_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+    def post(self):
+        """Revoke all access and refresh tokens of the current user."""
+        return process_logout_all_request()
@@ -0,0 +1,25 @@
+"""Business logic for /metrics API endpoints."""
+from flask_api import (
+    blacklist_filter,
+    compression,
+    hash_pool,
+    token_cache,
+    token_version_cache,
+    widget_count_cache,
+    widget_response_cache,
+)
+from flask_api.api.auth.decorators import admin_token_required
+
+
+@admin_token_required
+def retrieve_metrics():
+    """Counters are per process, each gunicorn worker reports its own values."""
+    return dict(
+        token_cache=token_cache.stats(),
+        token_version_cache=token_version_cache.stats(),
+        blacklist_filter=blacklist_filter.stats(),
+        hash_pool=hash_pool.stats(),
+        widget_count_cache=widget_count_cache.stats(),
+        widget_response_cache=widget_response_cache.stats(),
+        compression=compression.stats(),
+    )
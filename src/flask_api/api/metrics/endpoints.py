@@ -0,0 +1,22 @@
+"""API endpoint definitions for /metrics namespace."""
+from http import HTTPStatus
+
+from flask_restx import Namespace, Resource
+
+from flask_api.api.metrics.business import retrieve_metrics
+
+
+metrics_ns = Namespace(name="metrics", validate=True)
+
+
+@metrics_ns.route("", endpoint="metrics")
+class Metrics(Resource):
+    """Handles HTTP requests to URL: /metrics."""
+
+    @metrics_ns.doc(security="Bearer")
+    @metrics_ns.response(int(HTTPStatus.OK), "Retrieved metrics of this worker.")
+    @metrics_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+    @metrics_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+    def get(self):
+        """Retrieve cache and pool counters of the worker handling the request."""
+        return retrieve_metrics()
@@ -1,24 +1,81 @@
 """Business logic for /widgets API endpoints."""
+import csv
+import io
+from collections import namedtuple
+from hashlib import sha1
 from http import HTTPStatus
 
-from flask import jsonify, url_for
-from flask_restx import abort, marshal
+from flask import Response, g, request, stream_with_context, url_for
+from flask_restx import abort
+from flask_sqlalchemy import Pagination
+from sqlalchemy import and_, bindparam, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from werkzeug.http import is_resource_modified
 
-from flask_api import db
+from flask_api import db, json_provider, widget_count_cache, widget_response_cache
 from flask_api.api.auth.decorators import token_required, admin_token_required
-from flask_api.api.widgets.dto import pagination_model, widget_name
+from flask_api.api.widgets.dto import (
+    create_widget_validator,
+    encode_cursor,
+    pagination_serializer_for,
+    widget_model_for,
+    widget_name,
+    widget_serializer_for,
+)
 from flask_api.models.user import User
 from flask_api.models.widget import Widget
+from flask_api.util.datetime_util import utc_now
+from flask_api.util.db_util import is_unique_violation
+
+cursor_page = namedtuple(
+    "cursor_page", ["items", "per_page", "cursor", "sort", "has_prev", "has_next"]
+)
+cached_response = namedtuple(
+    "cached_response", ["data", "headers", "state", "widgets", "single"]
+)
+
+EXPORT_BATCH_SIZE = 500
+# Dialects with INSERT ... ON CONFLICT DO UPDATE, used by update_widget.
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+# Names per IN (...) query when looking up the widgets of a batch request.
+BATCH_LOOKUP_SIZE = 500
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Widget fields computed from the current time, they change without any update.
+CLOCK_FIELDS = ("deadline_passed", "time_remaining")
+
+SORT_COLUMNS = {
+    "name": Widget.name,
+    "created_at": Widget.created_at,
+    "deadline": Widget.deadline,
+}
+
+
+class _Pagination(Pagination):
+    """Pagination where the total may be unknown (None).
+
+    has_next is found by fetching one row more than per_page, so it does not
+    depend on the (possibly cached) total.
+    """
+
+    def __init__(self, page, per_page, total, items, has_next):
+        super().__init__(None, page, per_page, total, items)
+        self._has_next = has_next
+
+    @property
+    def pages(self):
+        return super().pages if self.total is not None else None
+
+    @property
+    def has_next(self):
+        return self._has_next
 
 
 @admin_token_required
 def create_widget(widget_dict):
     name = widget_dict["name"]
 
-    if Widget.find_by_name(name):
-        error = f"Widget name: {name} already exists, must be unique."
-        abort(HTTPStatus.CONFLICT, error, status="fail")
-
     """
     ** is the dictionary unpacking operator,
     you can find more info on it and the related list unpacking operator (*)
@@ -26,67 +83,301 @@ def create_widget(widget_dict):
     and deadline values to the Widget constructor.
     """
     widget = Widget(**widget_dict)
-    owner = User.find_by_public_id(create_widget.public_id)
-    widget.owner_id = owner.id
+    widget.owner_id = _token_owner_id().scalar_subquery()
     db.session.add(widget)
-    db.session.commit()
+    # The unique constraint on name detects duplicates, even concurrent ones.
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not is_unique_violation(e, Widget.__table__.c.name):
+            raise
+        error = f"Widget name: {name} already exists, must be unique."
+        abort(HTTPStatus.CONFLICT, error, status="fail")
+    _widgets_changed()
+
+    return _widget_created_response(name)
+
 
-    response = jsonify(status="success", message=f"New widget added: {name}.")
+def _widget_created_response(name):
+    message = f"New widget added: {name}."
+    response = json_provider.jsonify(status="success", message=message)
     response.status_code = HTTPStatus.CREATED
     response.headers["Location"] = url_for("api.widget", name=name)
+    return response
+
+
+@token_required
+def retrieve_widget_list(
+    page, per_page, total="exact", cursor=None, fields=None, sort=None, filters=None
+):
+    filters = filters or {}
+    # total=exact promises a COUNT(*) on every request, so it is never cached.
+    cache_key = None
+    if cursor is not None or total != "exact":
+        cache_key = (
+            "list",
+            page if cursor is None else None,
+            per_page,
+            total,
+            cursor if cursor is None else tuple(sorted(cursor.items())),
+            fields,
+            sort,
+            tuple(sorted(filters.items())),
+        )
+        cached = widget_response_cache.get(cache_key)
+        if cached:
+            return _cached_widget_response(cached, fields)
+
+    if cursor is not None:
+        pagination = _cursor_paginate(cursor, per_page, fields, sort, filters)
+        serializer = pagination_serializer_for(fields, cursor=True)
+    else:
+        query = _filter_widgets(_widget_query(fields), filters)
+        query = query.order_by(*_sort_order(sort))
+        count_key = tuple(sorted(filters.items()))
+        pagination = _paginate(query, page, per_page, total, count_key)
+        serializer = pagination_serializer_for(fields)
+    return _widget_list_response(pagination, serializer, fields, cache_key)
+
+
+def _paginate(query, page, per_page, total, count_key):
+    """Page of query results, with an exact, cached or no (None) total count."""
+    items = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+    has_next = len(items) > per_page
+    items = items[:per_page]
+
+    if total == "exact":
+        count = query.order_by(None).count()
+        widget_count_cache.set(count_key, count)
+    elif total == "cached":
+        count = widget_count_cache.get(count_key)
+        if count is None:
+            count = query.order_by(None).count()
+            widget_count_cache.set(count_key, count)
+    else:
+        count = None
+    return _Pagination(page, per_page, count, items, has_next)
+
+
+def _cursor_paginate(cursor, per_page, fields, sort, filters):
+    """Seek to the cursor position with WHERE id > ? instead of OFFSET, no COUNT."""
+    if cursor and cursor.get("sort") != sort:
+        error = "cursor was created for another sort order, start from an empty cursor."
+        abort(HTTPStatus.BAD_REQUEST, error, status="fail")
+
+    query = _filter_widgets(_widget_query(fields), filters)
+    # Pages before the cursor are read in reverse order, then flipped.
+    backwards = "before" in cursor
+    if cursor:
+        query = query.filter(_keyset_condition(cursor, sort, backwards))
+    query = query.order_by(*_sort_order(sort, reverse=backwards))
+
+    # One extra row tells whether there is another page in the same direction.
+    items = query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if "before" in cursor:
+        items.reverse()
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = bool(cursor), has_more
+
+    return cursor_page(items, per_page, cursor, sort, has_prev and bool(items), has_next)
+
+
+def _widget_list_response(pagination, serializer, fields, cache_key):
+    total = getattr(pagination, "total", None)
+
+    def build_data():
+        # Operate on an object and filter the object's attributes/keys against
+        # the provided API model and validate the object's data against
+        # the set of fields configured in the API model.
+        nav_links = _pagination_nav_links(pagination)
+        if isinstance(pagination, cursor_page):
+            response_data = serializer(pagination._asdict())
+        else:
+            response_data = serializer(pagination)
+        response_data["links"] = nav_links
+        if "total_items" in response_data and total is None:
+            del response_data["total_pages"]
+            del response_data["total_items"]
+        headers = {"Link": _pagination_nav_header_links(nav_links)}
+        if total is not None:
+            headers["Total-Count"] = str(total)
+        return response_data, headers
+
+    # Only If-None-Match is checked for lists: deleting a widget changes the
+    # list without changing the time of the most recent update (Last-Modified).
+    state = (total, pagination.has_prev, pagination.has_next)
+    return _widget_response(
+        pagination.items, fields, state, build_data, cache_key, single=False
+    )
+
 
+def _widget_response(widgets, fields, state, build_data, cache_key, single):
+    """JSON response for widgets, or 304 Not Modified if the client's copy is current.
+
+    The ETag covers the query string, state (total, prev/next of a list) and
+    whatever can change in each widget, so it changes with any create, update or
+    delete of a widget in the response. build_data is only called when the
+    response is not a 304, the response data is then cached under cache_key.
+    """
+    etag = _etag(
+        request.query_string,
+        state,
+        [_widget_validators(widget, fields) for widget in widgets],
+    )
+    # Fields computed from the clock change without any update of the widgets,
+    # only the ETag (which includes them) can tell if the client's copy is current.
+    last_modified = None
+    if not _clock_fields(fields):
+        last_modified = max(map(_last_modified, widgets), default=None)
+    not_modified = _not_modified(etag, last_modified, check_last_modified=single)
+    if not_modified:
+        return not_modified
+
+    response_data, headers = build_data()
+    response = json_provider.jsonify(response_data)
+    response.headers.extend(headers)
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    if cache_key is not None:
+        snapshots = [_widget_snapshot(widget) for widget in widgets]
+        entry = cached_response(response_data, headers, state, snapshots, single)
+        widget_response_cache.set(cache_key, entry, size=len(response.get_data()))
     return response
 
 
+def _cached_widget_response(cached, fields):
+    """Response from the cache, with the fields computed from the clock updated."""
+    widgets = [Widget(**snapshot) for snapshot in cached.widgets]
+
+    def build_data():
+        response_data = dict(cached.data)
+        if cached.single:
+            items = [response_data]
+        else:
+            items = [dict(item) for item in response_data["items"]]
+            response_data["items"] = items
+        for item, widget in zip(items, widgets):
+            if "deadline_passed" in item:
+                item["deadline_passed"] = widget.deadline_passed
+            if "time_remaining" in item:
+                item["time_remaining"] = widget.time_remaining_str
+        return response_data, cached.headers
+
+    return _widget_response(
+        widgets, fields, cached.state, build_data, None, cached.single
+    )
+
+
 @token_required
-def retrieve_widget_list(page, per_page):
-    pagination = Widget.query.paginate(page, per_page, error_out=False)
-    # Operate on an object and filter the object's attributes/keys against
-    # the provided API model and validate the object's data against
-    # the set of fields configured in the API model.
-    response_data = marshal(pagination, pagination_model)
-    response_data["links"] = _pagination_nav_links(pagination)
-    response = jsonify(response_data)
-    response.headers["Link"] = _pagination_nav_header_links(pagination)
-    response.headers["Total-Count"] = pagination.total
+def export_widgets(export_format, fields=None, sort=None, filters=None):
+    """Stream every widget matching filters, reading EXPORT_BATCH_SIZE rows at a time.
+
+    The access token is only checked when the export starts.
+    """
+    query = _filter_widgets(_widget_query(fields), filters or {})
+    query = query.order_by(*_sort_order(sort)).yield_per(EXPORT_BATCH_SIZE)
+    serializer = widget_serializer_for(fields)
+    rows = (serializer(widget) for widget in query)
+    if export_format == "csv":
+        chunks = _csv_chunks(rows, _csv_header(widget_model_for(fields)))
+    else:
+        chunks = _ndjson_chunks(rows)
+
+    response = Response(
+        stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[export_format]
+    )
+    disposition = f"attachment; filename=widgets.{export_format}"
+    response.headers["Content-Disposition"] = disposition
     return response
 
 
 @token_required
-def retrieve_widget(name):
-    return Widget.query.filter_by(name=name.lower()).first_or_404(
-        description=f"{name} not found in database."
+def retrieve_widget(name, fields=None):
+    cache_key = ("widget", name.lower(), fields)
+    cached = widget_response_cache.get(cache_key)
+    if cached:
+        return _cached_widget_response(cached, fields)
+
+    widget = (
+        _widget_query(fields)
+        .filter_by(name=name.lower())
+        .first_or_404(description=f"{name} not found in database.")
+    )
+    serializer = widget_serializer_for(fields)
+    return _widget_response(
+        [widget],
+        fields,
+        (),
+        lambda: (serializer(widget), {}),
+        cache_key,
+        single=True,
     )
 
 
 @admin_token_required
 def update_widget(name, widget_dict):
-    """ Update existing widget or create new one """
-    widget = Widget.find_by_name(name.lower())
-
-    # If the name provided by the client is found in the database,
-    # we save the retrieved Widget instance as widget.
-    # Next, we iterate over the items in widget_dict and overwrite
-    # the attributes of widget with the values provided by the client.
-    # Then, the updated widget is committed to the database.
-    if widget:
-        for k, v in widget_dict.items():
-            setattr(widget, k, v)
-
-        db.session.commit()
-        message = f"'{name}' was successfully updated"
-        response_dict = dict(status="success", message=message)
-        return response_dict, HTTPStatus.OK
-
+    """Update existing widget or create new one, with a single upsert statement."""
+    name = name.lower()
     try:
-        valid_name = widget_name(name.lower())
-
+        widget_name(name)
     except ValueError as e:
         abort(HTTPStatus.BAD_REQUEST, str(e), status="fail")
 
-    widget_dict["name"] = valid_name
+    created = _upsert_widget(name, widget_dict)
+    db.session.commit()
+    _widgets_changed()
+    if created:
+        return _widget_created_response(name)
+    message = f"'{name}' was successfully updated"
+    response_dict = dict(status="success", message=message)
+    return response_dict, HTTPStatus.OK
+
+
+def _upsert_widget(name, widget_dict):
+    """INSERT ... ON CONFLICT (name) DO UPDATE, returns True if the widget was created.
 
-    return create_widget(widget_dict)
+    The owner of a new widget is the user of the access token, found by a
+    subquery. Updated widgets keep their owner and get their version incremented,
+    so a version of 1 means the row was inserted. Dialects without upsert support
+    fall back to a SELECT followed by an INSERT or UPDATE.
+    """
+    table = Widget.__table__
+    dialect = db.engine.dialect.name
+    if dialect not in UPSERT_DIALECTS:
+        widget = Widget.find_by_name(name)
+        if not widget:
+            widget = Widget(name=name, **widget_dict)
+            widget.owner = User.find_by_public_id(g.token_payload.public_id)
+            db.session.add(widget)
+            db.session.flush()
+            return True
+        for k, v in widget_dict.items():
+            setattr(widget, k, v)
+        widget.version = Widget.version + 1
+        db.session.flush()
+        return False
+
+    statement = UPSERT_DIALECTS[dialect](table).values(
+        name=name, owner_id=_token_owner_id().scalar_subquery(), **widget_dict
+    )
+    # Column onupdate defaults are not applied to ON CONFLICT updates.
+    update_values = {key: statement.excluded[key] for key in widget_dict}
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.name],
+        set_=dict(update_values, version=table.c.version + 1, updated_at=utc_now()),
+    )
+    if dialect == "postgresql":
+        version = db.session.execute(statement.returning(table.c.version)).scalar()
+    else:
+        # SQLAlchemy 1.4 has no RETURNING for SQLite, read the row back instead.
+        db.session.execute(statement)
+        version = db.session.query(Widget.version).filter(Widget.name == name).scalar()
+    return version == 1
 
 
 @admin_token_required
@@ -96,36 +387,401 @@ def delete_widget(name):
     )
     db.session.delete(widget)
     db.session.commit()
+    _widgets_changed()
     return "", HTTPStatus.NO_CONTENT
 
 
+@admin_token_required
+def create_widgets(items):
+    """Create the valid widgets of a batch with a single INSERT and commit.
+
+    Each item gets its own status, invalid items and names that already exist
+    do not prevent the other widgets from being created.
+    """
+    results, valid = _validate_batch(items)
+    existing = _find_widget_ids(widget_dict["name"] for _, widget_dict in valid)
+    owner = User.find_by_public_id(g.token_payload.public_id)
+    inserts = []
+    for index, widget_dict in valid:
+        name = widget_dict["name"]
+        if name in existing:
+            error = f"Widget name: {name} already exists, must be unique."
+            results[index] = _batch_result(index, name, HTTPStatus.CONFLICT, error)
+            continue
+        existing[name] = None
+        inserts.append(dict(widget_dict, owner_id=owner.id))
+        message = f"New widget added: {name}."
+        results[index] = _batch_result(index, name, HTTPStatus.CREATED, message)
+    return _commit_batch(results, inserts=inserts)
+
+
+@admin_token_required
+def update_widgets(items):
+    """Update the widgets of a batch, creating those that do not exist (like PUT)."""
+    items = [
+        dict(item, name=item["name"].lower())
+        if isinstance(item, dict) and isinstance(item.get("name"), str)
+        else item
+        for item in items
+    ]
+    results, valid = _validate_batch(items)
+    existing = _find_widget_ids(widget_dict["name"] for _, widget_dict in valid)
+    owner = User.find_by_public_id(g.token_payload.public_id)
+    inserts, updates, seen = [], [], set()
+    for index, widget_dict in valid:
+        name = widget_dict.pop("name")
+        if name in seen:
+            error = f"Widget name: {name} appears more than once in the batch."
+            results[index] = _batch_result(index, name, HTTPStatus.CONFLICT, error)
+            continue
+        seen.add(name)
+        if name in existing:
+            updates.append(dict(widget_dict, _id=existing[name]))
+            message = f"'{name}' was successfully updated"
+            results[index] = _batch_result(index, name, HTTPStatus.OK, message)
+        else:
+            inserts.append(dict(widget_dict, name=name, owner_id=owner.id))
+            message = f"New widget added: {name}."
+            results[index] = _batch_result(index, name, HTTPStatus.CREATED, message)
+    return _commit_batch(results, inserts=inserts, updates=updates)
+
+
+@admin_token_required
+def delete_widgets(names):
+    """Delete the widgets of a batch with one DELETE per BATCH_LOOKUP_SIZE names."""
+    existing = _find_widget_ids(name.lower() for name in names if isinstance(name, str))
+    results, deletes = [], []
+    for index, name in enumerate(names):
+        if not isinstance(name, str):
+            error = "Widget name must be a string."
+            results.append(_batch_result(index, name, HTTPStatus.BAD_REQUEST, error))
+            continue
+        # Popped, so a name repeated in the batch is only deleted once.
+        widget_id = existing.pop(name.lower(), None)
+        if widget_id is None:
+            error = f"{name} not found in database."
+            results.append(_batch_result(index, name, HTTPStatus.NOT_FOUND, error))
+            continue
+        deletes.append(widget_id)
+        message = f"'{name}' was successfully deleted"
+        results.append(_batch_result(index, name, HTTPStatus.NO_CONTENT, message))
+    return _commit_batch(results, deletes=deletes)
+
+
+def _token_owner_id():
+    """Query for the id of the user of the access token, to use as a subquery."""
+    return User.query.with_entities(User.id).filter_by(
+        public_id=g.token_payload.public_id
+    )
+
+
+def _validate_batch(items):
+    """Validate each item of a batch like the body of POST /widgets.
+
+    Returns the list of results, holding an error for each invalid item and None
+    for the others, and (index, widget_dict) for each valid item.
+    """
+    results, valid = [], []
+    for index, item in enumerate(items):
+        widget_dict, errors = _parse_batch_item(item)
+        if errors:
+            name = item.get("name") if isinstance(item, dict) else None
+            message = "Input payload validation failed"
+            result = _batch_result(
+                index, name, HTTPStatus.BAD_REQUEST, message, errors=errors
+            )
+            results.append(result)
+        else:
+            results.append(None)
+            valid.append((index, widget_dict))
+    return results, valid
+
+
+def _parse_batch_item(item):
+    if not isinstance(item, dict):
+        return None, {"widget": "Must be an object."}
+    return create_widget_validator.validate(item)
+
+
+def _batch_result(index, name, status_code, message, **details):
+    status = "success" if status_code < HTTPStatus.BAD_REQUEST else "fail"
+    return dict(
+        index=index,
+        name=name,
+        status=status,
+        status_code=int(status_code),
+        message=message,
+        **details,
+    )
+
+
+def _find_widget_ids(names):
+    """Map the names that exist in the database to widget ids."""
+    names = list(dict.fromkeys(names))
+    found = {}
+    for start in range(0, len(names), BATCH_LOOKUP_SIZE):
+        chunk = names[start : start + BATCH_LOOKUP_SIZE]
+        query = db.session.query(Widget.name, Widget.id).filter(Widget.name.in_(chunk))
+        found.update(query)
+    return found
+
+
+def _commit_batch(results, inserts=(), updates=(), deletes=()):
+    """Write all changes of a batch in a single transaction.
+
+    Updated widgets get their version incremented (and updated_at set) by the
+    UPDATE statement itself, like in update_widget. Names are checked before
+    writing, a conflict here means another request created one of the widgets.
+    """
+    try:
+        _write_batch(inserts, updates, deletes)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not is_unique_violation(e, Widget.__table__.c.name):
+            raise
+        error = "A widget of the batch was created by another request, retry the batch."
+        abort(HTTPStatus.CONFLICT, error, status="fail")
+    if inserts or updates or deletes:
+        _widgets_changed()
+
+    failed = sum(result["status"] == "fail" for result in results)
+    response_dict = dict(
+        status="success" if not failed else "fail",
+        message=f"{len(results) - failed} succeeded, {failed} failed.",
+        results=results,
+    )
+    return response_dict, HTTPStatus.OK
+
+
+def _write_batch(inserts, updates, deletes):
+    table = Widget.__table__
+    if inserts:
+        db.session.bulk_insert_mappings(Widget, inserts)
+    if updates:
+        statement = (
+            table.update()
+            .where(table.c.id == bindparam("_id"))
+            .values(version=table.c.version + 1)
+        )
+        db.session.execute(statement, updates)
+    for start in range(0, len(deletes), BATCH_LOOKUP_SIZE):
+        chunk = deletes[start : start + BATCH_LOOKUP_SIZE]
+        db.session.execute(table.delete().where(table.c.id.in_(chunk)))
+
+
+def _widget_query(fields=None):
+    """Widget query that loads the owner columns used by widget_model in one SELECT.
+
+    Without this, marshalling each widget lazy loads its owner with a separate
+    SELECT (one per distinct owner on the page). The owner is not loaded at all
+    if fields is given and does not include it.
+    """
+    if fields is not None and "owner" not in fields:
+        return Widget.query
+    return Widget.query.options(
+        joinedload(Widget.owner, innerjoin=True).load_only(User.email, User.public_id)
+    )
+
+
+def _widget_validators(widget, fields):
+    """Values that determine the representation of widget with these fields."""
+    validators = [widget.id, widget.version]
+    clock_fields = _clock_fields(fields)
+    if "deadline_passed" in clock_fields:
+        validators.append(widget.deadline_passed)
+    if "time_remaining" in clock_fields:
+        validators.append(widget.time_remaining_str)
+    return validators
+
+
+def _clock_fields(fields):
+    """The requested fields (None for all) computed from the current time."""
+    if fields is None:
+        return CLOCK_FIELDS
+    return tuple(field for field in CLOCK_FIELDS if field in fields)
+
+
+def _widget_snapshot(widget):
+    """Columns needed to recompute validators and time fields of a cached widget."""
+    return dict(
+        id=widget.id,
+        version=widget.version,
+        deadline=widget.deadline,
+        created_at=widget.created_at,
+        updated_at=widget.updated_at,
+    )
+
+
+def _widgets_changed():
+    """Forget cached counts and responses after a write, in this process only."""
+    widget_count_cache.invalidate()
+    widget_response_cache.invalidate()
+
+
+def _last_modified(widget):
+    return widget.updated_at or widget.created_at
+
+
+def _etag(*validators):
+    """Strong ETag for a representation built from these values."""
+    return sha1(repr(validators).encode()).hexdigest()
+
+
+def _not_modified(etag, last_modified, check_last_modified=True):
+    """304 Not Modified response if the client's copy is current, else None."""
+    if is_resource_modified(
+        request.environ,
+        etag=etag,
+        last_modified=last_modified if check_last_modified else None,
+    ):
+        return None
+    response = Response(status=HTTPStatus.NOT_MODIFIED)
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
+
+
+def _ndjson_chunks(rows):
+    lines = []
+    for row in rows:
+        lines.append(json_provider.dumps(row))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def _csv_header(model):
+    """Column names, nested owner fields are flattened to owner.email, ..."""
+    header = []
+    for name, field in model.items():
+        if name == "owner":
+            header.extend(f"owner.{owner_field}" for owner_field in field.nested)
+        else:
+            header.append(name)
+    return header
+
+
+def _csv_chunks(rows, header):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=header)
+    writer.writeheader()
+    for count, row in enumerate(rows, start=1):
+        owner = row.pop("owner", None) or {}
+        row.update((f"owner.{name}", value) for name, value in owner.items())
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _filter_widgets(query, filters):
+    """Apply the GET /widgets filters (see WIDGET_LIST_FILTERS) to query."""
+    if filters.get("owner") is not None:
+        owner_id = User.query.with_entities(User.id).filter_by(
+            public_id=filters["owner"]
+        )
+        query = query.filter(Widget.owner_id == owner_id.scalar_subquery())
+    if filters.get("deadline_passed") is not None:
+        passed = Widget.deadline_passed
+        query = query.filter(passed if filters["deadline_passed"] else ~passed)
+    if filters.get("created_after") is not None:
+        query = query.filter(Widget.created_at >= filters["created_after"])
+    if filters.get("created_before") is not None:
+        query = query.filter(Widget.created_at < filters["created_before"])
+    if filters.get("deadline_after") is not None:
+        query = query.filter(Widget.deadline >= filters["deadline_after"])
+    if filters.get("deadline_before") is not None:
+        query = query.filter(Widget.deadline < filters["deadline_before"])
+    return query
+
+
+def _sort_order(sort, reverse=False):
+    """ORDER BY clauses for sort ("name", "-deadline", ...), ties broken by id."""
+    descending = bool(sort and sort.startswith("-")) != reverse
+    columns = [SORT_COLUMNS[sort.lstrip("-")]] if sort else []
+    columns.append(Widget.id)
+    return [column.desc() if descending else column.asc() for column in columns]
+
+
+def _keyset_condition(cursor, sort, backwards):
+    """Rows that come after (or before if backwards) the cursor in sort order."""
+    row_id = cursor["before"] if backwards else cursor["after"]
+    greater = bool(sort and sort.startswith("-")) == backwards
+    if not sort:
+        return Widget.id > row_id if greater else Widget.id < row_id
+
+    column, key = SORT_COLUMNS[sort.lstrip("-")], cursor["key"]
+    if greater:
+        return or_(column > key, and_(column == key, Widget.id > row_id))
+    return or_(column < key, and_(column == key, Widget.id < row_id))
+
+
+def _cursor_position(widget, sort, direction):
+    """Cursor for the page after/before widget ("after" or "before" direction)."""
+    if not sort:
+        return encode_cursor(**{direction: widget.id})
+    key = getattr(widget, sort.lstrip("-"))
+    if sort.lstrip("-") != "name":
+        key = key.isoformat()
+    return encode_cursor(**{direction: widget.id, "sort": sort, "key": key})
+
+
+def _widget_list_url(**params):
+    """URL of the widget list with the query string of this request, updated."""
+    args = request.args.to_dict()
+    args.update(params)
+    return url_for("api.widget_list", **args)
+
+
 def _pagination_nav_links(pagination):
+    if isinstance(pagination, cursor_page):
+        return _cursor_nav_links(pagination)
+
     nav_links = {}
     per_page = pagination.per_page
     this_page = pagination.page
     last_page = pagination.pages
-    nav_links["self"] = url_for("api.widget_list", page=this_page, per_page=per_page)
-    nav_links["first"] = url_for("api.widget_list", page=1, per_page=per_page)
+    nav_links["self"] = _widget_list_url(page=this_page, per_page=per_page)
+    nav_links["first"] = _widget_list_url(page=1, per_page=per_page)
 
     if pagination.has_prev:
-        nav_links["prev"] = url_for(
-            "api.widget_list", page=this_page - 1, per_page=per_page
-        )
+        nav_links["prev"] = _widget_list_url(page=this_page - 1, per_page=per_page)
 
     if pagination.has_next:
-        nav_links["next"] = url_for(
-            "api.widget_list", page=this_page + 1, per_page=per_page
-        )
+        nav_links["next"] = _widget_list_url(page=this_page + 1, per_page=per_page)
+
+    if last_page is not None:
+        nav_links["last"] = _widget_list_url(page=last_page, per_page=per_page)
+    return nav_links
+
+
+def _cursor_nav_links(page):
+    nav_links = {}
+    per_page = page.per_page
+    nav_links["self"] = _widget_list_url(per_page=per_page)
+    nav_links["first"] = _widget_list_url(cursor="", per_page=per_page)
+
+    if page.has_prev:
+        prev_cursor = _cursor_position(page.items[0], page.sort, "before")
+        nav_links["prev"] = _widget_list_url(cursor=prev_cursor, per_page=per_page)
+
+    if page.has_next and page.items:
+        next_cursor = _cursor_position(page.items[-1], page.sort, "after")
+        nav_links["next"] = _widget_list_url(cursor=next_cursor, per_page=per_page)
 
-    nav_links["last"] = url_for("api.widget_list", page=last_page, per_page=per_page)
     return nav_links
 
 
-def _pagination_nav_header_links(pagination):
-    url_dict = _pagination_nav_links(pagination)
+def _pagination_nav_header_links(nav_links):
     link_header = ""
 
-    for rel, url in url_dict.items():
+    for rel, url in nav_links.items():
         link_header += f'<{url}>; rel="{rel}", '
 
     return link_header.strip().strip(",")
@@ -1,16 +1,42 @@
 """Parsers and serializers for /widgets API endpoints."""
+import binascii
+import json
 import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from datetime import date, datetime, time, timezone
+from functools import lru_cache
 
 from dateutil import parser
+from flask import current_app, g, has_request_context, url_for
 from flask_restx import Model
-from flask_restx.fields import Boolean, DateTime, Integer, List, Nested, String, Url
-from flask_restx.inputs import positive, URL
+from flask_restx.fields import Boolean, DateTime, Integer, List, Nested, String
+from flask_restx.inputs import boolean, positive, URL
 from flask_restx.reqparse import RequestParser
 
 from flask_api.util.datetime_util import make_tzaware, DATE_MONTH_NAME
+from flask_api.util.serializer import compile_model
+from flask_api.util.validator import compile_parser
 
 
+WIDGET_LIST_FILTERS = (
+    "owner",
+    "deadline_passed",
+    "created_after",
+    "created_before",
+    "deadline_after",
+    "deadline_before",
+)
+WIDGET_SORT_FIELDS = ("name", "created_at", "deadline")
+# Static routes under /widgets, a widget with one of these names couldn't be read.
+RESERVED_WIDGET_NAMES = ("export",)
+
+# YYYY-MM-DD, optionally followed by an ISO 8601 time and UTC offset.
+ISO_DATE_REGEX = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](?:[01]\d|2[0-3]):[0-5]\d(?::[0-5]\d(?:\.\d{1,6})?)?"
+    r"(?:Z|[+-]\d{2}:?\d{2})?)?$"
+)
+
 # This is not used anywhere and is here for doc purpose.
 NAME_REGEX = re.compile(
     r"""
@@ -30,13 +56,53 @@ def widget_name(name):
             f"'{name}' contains one or more invalid characters. Widget name must "
             "contain only letters, numbers, hyphen and underscore characters."
         )
+    if name.lower() in RESERVED_WIDGET_NAMES:
+        raise ValueError(f"'{name}' is reserved and can't be used as a widget name.")
     return name
 
 
 def future_date_from_string(date_str):
     """Validation method for a date in the future, formatted as a string."""
+    parsed_date = _deadline_date(date_str)
+    today = _today()
+    if parsed_date < today:
+        raise ValueError(
+            f"Successfully parsed {date_str} as "
+            f"{parsed_date.strftime(DATE_MONTH_NAME)}. However, this value must be a "
+            f"date in the future and {parsed_date.strftime(DATE_MONTH_NAME)} is BEFORE "
+            f"{today.strftime(DATE_MONTH_NAME)}"
+        )
+    deadline = datetime.combine(parsed_date, time.max)
+    deadline_utc = make_tzaware(deadline, use_tz=timezone.utc)
+    return deadline_utc
+
+
+def _deadline_date(date_str):
+    """Date of date_str, memoized per request since batches repeat the same deadlines."""
+    if not isinstance(date_str, str):
+        return _parse_date(date_str)
+    memo = g.setdefault("deadline_dates", {}) if has_request_context() else {}
+    parsed_date = memo.get(date_str)
+    if parsed_date is None:
+        parsed_date = memo[date_str] = iso_date(date_str) or _parse_date(date_str)
+    return parsed_date
+
+
+def iso_date(date_str):
+    """Date of an ISO 8601 date (or date and time) string, None for other formats."""
+    match = ISO_DATE_REGEX.match(date_str)
+    if not match:
+        return None
+    try:
+        return date(int(match[1]), int(match[2]), int(match[3]))
+    except ValueError:
+        return None
+
+
+def _parse_date(date_str):
+    """Date of a free-form date string, parsed by dateutil."""
     try:
-        parsed_date = parser.parse(date_str)
+        return parser.parse(date_str).date()
     except ValueError:
         raise ValueError(
             f"Failed to parse '{date_str}' as a valid date. You can use any format "
@@ -45,16 +111,95 @@ def future_date_from_string(date_str):
             "-or- 'May 13 2018'."
         )
 
-    if parsed_date.date() < date.today():
+
+def _today():
+    """Today's date, computed once per request so that all items of a batch agree."""
+    if not has_request_context():
+        return date.today()
+    return g.setdefault("deadline_today", date.today())
+
+
+def utc_datetime_from_string(datetime_str):
+    """Validation method for a date or date and time, returned as naive UTC."""
+    try:
+        parsed = parser.parse(datetime_str)
+    except (ValueError, OverflowError):
         raise ValueError(
-            f"Successfully parsed {date_str} as "
-            f"{parsed_date.strftime(DATE_MONTH_NAME)}. However, this value must be a "
-            f"date in the future and {parsed_date.strftime(DATE_MONTH_NAME)} is BEFORE "
-            f"{datetime.now().strftime(DATE_MONTH_NAME)}"
+            f"Failed to parse '{datetime_str}' as a valid date. You can use any format "
+            "recognized by dateutil.parser, for example: '2018-05-13' -or- "
+            "'2018-05-13T14:30:00+02:00'. Dates without a time zone are in UTC."
         )
-    deadline = datetime.combine(parsed_date.date(), time.max)
-    deadline_utc = make_tzaware(deadline, use_tz=timezone.utc)
-    return deadline_utc
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def encode_cursor(**position):
+    """Opaque pagination cursor for a position in the widget list."""
+    position_json = json.dumps(position, separators=(",", ":")).encode()
+    return urlsafe_b64encode(position_json).decode().rstrip("=")
+
+
+def widget_cursor(cursor_str):
+    """Validation method for a pagination cursor, empty string for the first page.
+
+    A cursor holds the id of the first/last widget of a page ("before"/"after")
+    and, if the list is sorted, the sort order and the value of the sort column.
+    """
+    if not cursor_str:
+        return {}
+    try:
+        padding = "=" * (-len(cursor_str) % 4)
+        position = json.loads(urlsafe_b64decode(cursor_str + padding))
+        if not isinstance(position, dict):
+            raise ValueError
+        if set(position) - {"after", "before", "sort", "key"}:
+            raise ValueError
+        if len({"after", "before"} & set(position)) != 1:
+            raise ValueError
+        if not isinstance(position.get("after", position.get("before")), int):
+            raise ValueError
+        if "sort" in position:
+            sort_field = position["sort"].lstrip("-")
+            if sort_field not in WIDGET_SORT_FIELDS:
+                raise ValueError
+            if sort_field != "name":
+                position["key"] = datetime.fromisoformat(position["key"])
+            elif not isinstance(position["key"], str):
+                raise ValueError
+        elif "key" in position:
+            raise ValueError
+    except (ValueError, TypeError, KeyError, AttributeError, binascii.Error):
+        raise ValueError(
+            f"'{cursor_str}' is not a valid cursor. Use the links returned with the "
+            "previous page, or an empty cursor to start from the first page."
+        )
+    return position
+
+
+def widget_fields(fields_str):
+    """Validation method for a comma-separated list of widget_model field names."""
+    fields = {field.strip() for field in fields_str.split(",") if field.strip()}
+    unknown = fields.difference(widget_model)
+    if not fields or unknown:
+        raise ValueError(
+            f"'{fields_str}' is not a valid list of fields. Fields must be separated "
+            f"by commas and chosen from: {', '.join(widget_model)}."
+        )
+    # Same order as widget_model, so equal selections share a cached model.
+    return tuple(field for field in widget_model if field in fields)
+
+
+def batch_items(items):
+    """Validation method for the array of a batch request (WIDGET_BATCH_MAX_SIZE)."""
+    if not isinstance(items, list) or not items:
+        raise ValueError("Must be a non-empty array.")
+    max_size = current_app.config.get("WIDGET_BATCH_MAX_SIZE")
+    if len(items) > max_size:
+        raise ValueError(
+            f"A batch can contain at most {max_size} items, this one has {len(items)}."
+        )
+    return items
 
 
 create_widget_reqparser = RequestParser(bundle_errors=True)
@@ -84,11 +229,72 @@ create_widget_reqparser.add_argument(
 update_widget_reqparser = create_widget_reqparser.copy()
 update_widget_reqparser.remove_argument("name")
 
+# Validate a JSON or form body with the arguments of the parsers above.
+create_widget_validator = compile_parser(create_widget_reqparser)
+update_widget_validator = compile_parser(update_widget_reqparser)
+
+# Batch requests: each widget is validated by create_widget_validator.
+widget_batch_reqparser = RequestParser(bundle_errors=True)
+widget_batch_reqparser.add_argument(
+    "widgets", type=batch_items, location="json", required=True, nullable=False
+)
+widget_batch_delete_reqparser = RequestParser(bundle_errors=True)
+widget_batch_delete_reqparser.add_argument(
+    "names", type=batch_items, location="json", required=True, nullable=False
+)
+
+# Sparse fieldsets: only the selected widget fields are computed and returned.
+widget_fields_reqparser = RequestParser(bundle_errors=True)
+widget_fields_reqparser.add_argument("fields", type=widget_fields, required=False)
+
 pagination_reqparser = RequestParser(bundle_errors=True)
 pagination_reqparser.add_argument("page", type=positive, required=False, default=1)
 pagination_reqparser.add_argument(
     "per_page", type=positive, required=False, choices=[5, 10, 25, 50, 100], default=10
 )
+# Filters, ranges include the "after" date and exclude the "before" date.
+pagination_reqparser.add_argument("owner", type=str, required=False)
+pagination_reqparser.add_argument("deadline_passed", type=boolean, required=False)
+pagination_reqparser.add_argument(
+    "created_after", type=utc_datetime_from_string, required=False
+)
+pagination_reqparser.add_argument(
+    "created_before", type=utc_datetime_from_string, required=False
+)
+pagination_reqparser.add_argument(
+    "deadline_after", type=utc_datetime_from_string, required=False
+)
+pagination_reqparser.add_argument(
+    "deadline_before", type=utc_datetime_from_string, required=False
+)
+# Sort field, prefixed with "-" for descending order. Default is creation order.
+pagination_reqparser.add_argument(
+    "sort",
+    type=str,
+    required=False,
+    choices=[f"{prefix}{field}" for field in WIDGET_SORT_FIELDS for prefix in ("", "-")],
+)
+# exact: COUNT(*) on every request, cached: count cached for
+# WIDGET_COUNT_CACHE_TTL seconds, none: no totals and no "last" link.
+pagination_reqparser.add_argument(
+    "total",
+    type=str,
+    required=False,
+    choices=["exact", "cached", "none"],
+    default="cached",
+)
+pagination_reqparser.add_argument("fields", type=widget_fields, required=False)
+# Keyset pagination: pages follow widget ids instead of page numbers, which
+# avoids OFFSET and COUNT(*) queries. Ignores page, totals are not included.
+pagination_reqparser.add_argument("cursor", type=widget_cursor, required=False)
+
+# Same filters, sort and fields as the widget list, without paging.
+export_reqparser = pagination_reqparser.copy()
+for argument in ("page", "per_page", "total", "cursor"):
+    export_reqparser.remove_argument(argument)
+export_reqparser.add_argument(
+    "format", type=str, required=False, choices=["ndjson", "csv"], default="ndjson"
+)
 
 widget_owner_model = Model("Widget Owner", {"email": String, "public_id": String})
 
@@ -112,7 +318,9 @@ widget_model = Model(
         # }
         "owner": Nested(widget_owner_model),
         # "link": "/api/v1/widgets/first_widget",
-        "link": Url("api.widget"),
+        # fields.Url passes every attribute of the widget to url_for, which
+        # stringifies the owner and can trigger extra queries.
+        "link": String(attribute=lambda widget: url_for("api.widget", name=widget.name)),
     },
 )
 
@@ -135,3 +343,54 @@ pagination_model = Model(
         "items": List(Nested(widget_model)),
     },
 )
+
+cursor_pagination_model = Model(
+    "Cursor Pagination",
+    {
+        "links": Nested(pagination_links_model, skip_none=True),
+        "has_prev": Boolean,
+        "has_next": Boolean,
+        "items_per_page": Integer(attribute="per_page"),
+        "items": List(Nested(widget_model)),
+    },
+)
+
+
+@lru_cache(maxsize=128)
+def widget_model_for(fields):
+    """widget_model reduced to a tuple of fields, or widget_model if fields is None."""
+    if fields is None:
+        return widget_model
+    return Model(
+        f"Widget ({', '.join(fields)})", {field: widget_model[field] for field in fields}
+    )
+
+
+@lru_cache(maxsize=128)
+def pagination_model_for(fields, cursor=False):
+    """Pagination model (cursor or page numbers) listing widgets reduced to fields."""
+    page_model = cursor_pagination_model if cursor else pagination_model
+    if fields is None:
+        return page_model
+    return Model(
+        f"{page_model.name} ({', '.join(fields)})",
+        {**page_model, "items": List(Nested(widget_model_for(fields)))},
+    )
+
+
+@lru_cache(maxsize=128)
+def widget_serializer_for(fields):
+    """Compiled serializer for widget_model_for(fields), same output as marshal."""
+    return compile_model(widget_model_for(fields))
+
+
+@lru_cache(maxsize=128)
+def pagination_serializer_for(fields, cursor=False):
+    """Compiled serializer for pagination_model_for(fields, cursor)."""
+    return compile_model(pagination_model_for(fields, cursor))
+
+
+# Compile the full models at import, reduced ones are compiled on first use.
+widget_serializer = widget_serializer_for(None)
+pagination_serializer = pagination_serializer_for(None)
+cursor_pagination_serializer = pagination_serializer_for(None, cursor=True)
@@ -4,20 +4,32 @@ from http import HTTPStatus
 from flask_restx import Namespace, Resource
 
 from flask_api.api.widgets.dto import (
+    WIDGET_LIST_FILTERS,
     create_widget_reqparser,
     update_widget_reqparser,
+    create_widget_validator,
+    update_widget_validator,
+    widget_batch_reqparser,
+    widget_batch_delete_reqparser,
     pagination_reqparser,
+    widget_fields_reqparser,
+    export_reqparser,
     widget_owner_model,
     widget_model,
     pagination_links_model,
     pagination_model,
+    cursor_pagination_model,
 )
 from flask_api.api.widgets.business import (
     create_widget,
     retrieve_widget_list,
+    export_widgets,
     retrieve_widget,
     update_widget,
     delete_widget,
+    create_widgets,
+    update_widgets,
+    delete_widgets,
 )
 
 
@@ -26,6 +38,7 @@ widget_ns.models[widget_owner_model.name] = widget_owner_model
 widget_ns.models[widget_model.name] = widget_model
 widget_ns.models[pagination_links_model.name] = pagination_links_model
 widget_ns.models[pagination_model.name] = pagination_model
+widget_ns.models[cursor_pagination_model.name] = cursor_pagination_model
 
 
 @widget_ns.route("", endpoint="widget_list")
@@ -43,7 +56,12 @@ class WidgetList(Resource):
         request_data = pagination_reqparser.parse_args()
         page = request_data.get("page")
         per_page = request_data.get("per_page")
-        return retrieve_widget_list(page, per_page)
+        total = request_data.get("total")
+        cursor = request_data.get("cursor")
+        fields = request_data.get("fields")
+        sort = request_data.get("sort")
+        filters = _list_filters(request_data)
+        return retrieve_widget_list(page, per_page, total, cursor, fields, sort, filters)
 
     @widget_ns.doc(security="Bearer")
     @widget_ns.response(int(HTTPStatus.CREATED), "Added new widget.")
@@ -52,10 +70,84 @@ class WidgetList(Resource):
     @widget_ns.expect(create_widget_reqparser)
     def post(self):
         """Create a widget."""
-        widget_dict = create_widget_reqparser.parse_args()
+        widget_dict = create_widget_validator()
         return create_widget(widget_dict)
 
 
+@widget_ns.route("/batch/create", endpoint="widget_batch_create")
+@widget_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@widget_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@widget_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+@widget_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class WidgetBatchCreate(Resource):
+    """Handles HTTP requests to URL: /widgets/batch/create."""
+
+    @widget_ns.doc(security="Bearer")
+    @widget_ns.response(int(HTTPStatus.OK), "Status of each widget in the batch.")
+    @widget_ns.expect(widget_batch_reqparser)
+    def post(self):
+        """Create widgets in one transaction."""
+        request_data = widget_batch_reqparser.parse_args()
+        return create_widgets(request_data["widgets"])
+
+
+@widget_ns.route("/batch/update", endpoint="widget_batch_update")
+@widget_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@widget_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@widget_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+@widget_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class WidgetBatchUpdate(Resource):
+    """Handles HTTP requests to URL: /widgets/batch/update."""
+
+    @widget_ns.doc(security="Bearer")
+    @widget_ns.response(int(HTTPStatus.OK), "Status of each widget in the batch.")
+    @widget_ns.expect(widget_batch_reqparser)
+    def post(self):
+        """Update widgets in one transaction, creating those that do not exist."""
+        request_data = widget_batch_reqparser.parse_args()
+        return update_widgets(request_data["widgets"])
+
+
+@widget_ns.route("/batch/delete", endpoint="widget_batch_delete")
+@widget_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@widget_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@widget_ns.response(int(HTTPStatus.FORBIDDEN), "Administrator token required.")
+@widget_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class WidgetBatchDelete(Resource):
+    """Handles HTTP requests to URL: /widgets/batch/delete."""
+
+    @widget_ns.doc(security="Bearer")
+    @widget_ns.response(int(HTTPStatus.OK), "Status of each widget in the batch.")
+    @widget_ns.expect(widget_batch_delete_reqparser)
+    def post(self):
+        """Delete widgets by name in one transaction."""
+        request_data = widget_batch_delete_reqparser.parse_args()
+        return delete_widgets(request_data["names"])
+
+
+@widget_ns.route("/export", endpoint="widget_export")
+@widget_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
+@widget_ns.response(int(HTTPStatus.UNAUTHORIZED), "Unauthorized.")
+@widget_ns.response(int(HTTPStatus.INTERNAL_SERVER_ERROR), "Internal server error.")
+class WidgetExport(Resource):
+    """Handles HTTP requests to URL: /widgets/export."""
+
+    @widget_ns.doc(security="Bearer")
+    @widget_ns.response(int(HTTPStatus.OK), "Streaming every widget (NDJSON or CSV).")
+    @widget_ns.produces(["application/x-ndjson", "text/csv"])
+    @widget_ns.expect(export_reqparser)
+    def get(self):
+        """Export all widgets."""
+        request_data = export_reqparser.parse_args()
+        filters = _list_filters(request_data)
+        return export_widgets(
+            request_data.get("format"),
+            request_data.get("fields"),
+            request_data.get("sort"),
+            filters,
+        )
+
+
 @widget_ns.route("/<name>", endpoint="widget")
 @widget_ns.param("name", "Widget name")
 @widget_ns.response(int(HTTPStatus.BAD_REQUEST), "Validation error.")
@@ -67,10 +159,11 @@ class Widget(Resource):
 
     @widget_ns.doc(security="Bearer")
     @widget_ns.response(HTTPStatus.OK, "Retrieved widget.", widget_model)
-    @widget_ns.marshal_with(widget_model)
+    @widget_ns.expect(widget_fields_reqparser)
     def get(self, name):
         """Retrieve a widget."""
-        return retrieve_widget(name)
+        request_data = widget_fields_reqparser.parse_args()
+        return retrieve_widget(name, request_data.get("fields"))
 
     @widget_ns.doc(security="Bearer")
     @widget_ns.response(int(HTTPStatus.OK), "Widget was updated.", widget_model)
@@ -79,7 +172,7 @@ class Widget(Resource):
     @widget_ns.expect(update_widget_reqparser)
     def put(self, name):
         """Update a widget."""
-        widget_dict = update_widget_reqparser.parse_args()
+        widget_dict = update_widget_validator()
         return update_widget(name, widget_dict)
 
     @widget_ns.doc(security="Bearer")
@@ -88,3 +181,12 @@ class Widget(Resource):
     def delete(self, name):
         """Delete a widget."""
         return delete_widget(name)
+
+
+def _list_filters(request_data):
+    """Filters (WIDGET_LIST_FILTERS) given in the request."""
+    return {
+        name: request_data[name]
+        for name in WIDGET_LIST_FILTERS
+        if request_data.get(name) is not None
+    }
@@ -14,13 +14,61 @@ class Config:
 
     SECRET_KEY = os.getenv("SECRET_KEY", "open sesame")
     BCRYPT_LOG_ROUNDS = 4
+    # Password hashing runs on a "thread" or "process" pool ("inline" = no pool).
+    # Requests beyond SIZE + QUEUE_LIMIT jobs, or waiting longer than TIMEOUT
+    # seconds, get 503 Service Unavailable.
+    BCRYPT_POOL_TYPE = "thread"
+    BCRYPT_POOL_SIZE = 2
+    BCRYPT_POOL_QUEUE_LIMIT = 16
+    BCRYPT_POOL_TIMEOUT = 10
     TOKEN_EXPIRE_HOURS = 0
     TOKEN_EXPIRE_MINUTES = 0
+    REFRESH_TOKEN_EXPIRE_DAYS = 30
+    # Per-process cache of verified tokens. TTL bounds how long a token revoked
+    # by another worker can still be accepted by this one.
+    TOKEN_CACHE_MAXSIZE = 4096
+    TOKEN_CACHE_TTL = 60
+    # Per-process cache of User.token_version, TTL bounds how long tokens of a
+    # user logged out everywhere (by another worker) can still be accepted.
+    TOKEN_VERSION_CACHE_MAXSIZE = 4096
+    TOKEN_VERSION_CACHE_TTL = 30
+    # In-memory Bloom filter of blacklisted tokens, lets most token checks skip
+    # the database. REFRESH is how often (seconds) rows added by other workers
+    # are loaded into it.
+    BLACKLIST_FILTER_ENABLED = True
+    BLACKLIST_FILTER_CAPACITY = 100000
+    BLACKLIST_FILTER_ERROR_RATE = 0.001
+    BLACKLIST_FILTER_REFRESH = 5
+    # Delete expired blacklisted and refresh tokens every PURGE_INTERVAL seconds
+    # from background threads (0 disables it, see also: flask purge-blacklist).
+    BLACKLIST_PURGE_INTERVAL = 0
+    BLACKLIST_PURGE_BATCH_SIZE = 1000
+    # Per-process cache of widget counts for total=cached list requests, TTL
+    # bounds how stale totals are after widgets are added or deleted elsewhere.
+    WIDGET_COUNT_CACHE_MAXSIZE = 256
+    WIDGET_COUNT_CACHE_TTL = 30
+    # Per-process cache of GET /widgets (except total=exact) and /widgets/<name>
+    # responses, emptied on writes by this worker. TTL bounds staleness after
+    # writes by other workers, and for lists filtered on deadline_passed.
+    WIDGET_RESPONSE_CACHE_MAXSIZE = 1024
+    WIDGET_RESPONSE_CACHE_MAXBYTES = 16 * 1024 * 1024
+    WIDGET_RESPONSE_CACHE_TTL = 10
+    # Largest number of widgets accepted by the /widgets/batch endpoints.
+    WIDGET_BATCH_MAX_SIZE = 10000
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     PRESERVE_CONTEXT_ON_EXCEPTION = False
     SWAGGER_UI_DOC_EXPANSION = "list"
     RESTX_MASK_SWAGGER = False
     JSON_SORT_KEYS = False
+    # gzip responses for clients sending Accept-Encoding: gzip. Bodies smaller
+    # than MIN_SIZE bytes and no-store responses (tokens) are sent as is.
+    COMPRESS_ENABLED = True
+    COMPRESS_LEVEL = 6
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_MIMETYPES = ("application/json", "application/x-ndjson", "text/csv")
+    # Encoder for JSON responses: "orjson", "json" (stdlib) or "auto" (orjson
+    # when it is installed, json otherwise).
+    JSON_PROVIDER = "auto"
 
 
 class TestingConfig(Config):
@@ -0,0 +1,78 @@
+"""Class definition for RefreshToken."""
+import secrets
+from datetime import timedelta
+
+from flask import current_app
+
+from flask_api import db
+from flask_api.util.datetime_util import utc_now
+from flask_api.util.db_util import digest_token, purge_expired
+
+
+class RefreshToken(db.Model):
+    """RefreshToken Model for storing digests of issued refresh tokens.
+
+    Each refresh token can be exchanged once for a new access token and a new
+    refresh token (rotation). Presenting a refresh token that was already used
+    revokes every refresh token of its user, since it was likely stolen.
+    """
+
+    __tablename__ = "refresh_token"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    token_digest = db.Column(db.String(64), unique=True, nullable=False)
+    issued_on = db.Column(db.DateTime, default=utc_now)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_on = db.Column(db.DateTime)
+
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("site_user.id"), nullable=False, index=True
+    )
+    user = db.relationship("User")
+
+    def __repr__(self):
+        return f"<RefreshToken user_id={self.user_id}, expires_at={self.expires_at}>"
+
+    @property
+    def expired(self):
+        return self.expires_at <= utc_now().replace(tzinfo=None)
+
+    digest = staticmethod(digest_token)
+
+    @classmethod
+    def issue(cls, user):
+        """Add a new refresh token for user to the session, return its value."""
+        token = secrets.token_urlsafe(48)
+        expire_days = current_app.config.get("REFRESH_TOKEN_EXPIRE_DAYS")
+        expires_at = utc_now().replace(tzinfo=None) + timedelta(days=expire_days)
+        db.session.add(
+            cls(token_digest=cls.digest(token), user_id=user.id, expires_at=expires_at)
+        )
+        return token
+
+    @classmethod
+    def find_by_token(cls, token):
+        return cls.query.filter_by(token_digest=cls.digest(token)).first()
+
+    def revoke(self):
+        """Mark this token as used, False if it already was (caller commits)."""
+        revoked = RefreshToken.query.filter_by(id=self.id, revoked_on=None).update(
+            dict(revoked_on=utc_now().replace(tzinfo=None)), synchronize_session=False
+        )
+        return revoked == 1
+
+    @classmethod
+    def revoke_all(cls, user_id):
+        """Revoke every refresh token of a user (caller commits)."""
+        cls.query.filter_by(user_id=user_id, revoked_on=None).update(
+            dict(revoked_on=utc_now().replace(tzinfo=None)), synchronize_session=False
+        )
+
+    @classmethod
+    def purge_expired(cls, batch_size=1000):
+        """Delete expired tokens, used or not, committing every batch_size rows.
+
+        An expired token is rejected whether or not it was used, so its row is
+        no longer needed to detect reuse.
+        """
+        return purge_expired(cls, batch_size)
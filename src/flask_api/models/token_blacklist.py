@@ -1,28 +1,80 @@
 """Class definition for BlacklistedToken."""
+import time
 from datetime import timezone
 
-from flask_api import db
+from flask_api import db, blacklist_filter
 from flask_api.util.datetime_util import utc_now, dtaware_fromtimestamp
+from flask_api.util.db_util import digest_token, purge_expired
+
+# Concurrent transactions can commit ids out of order, so each refresh of the
+# blacklist filter re-reads this many ids below the highest one already seen.
+FILTER_REFRESH_ID_OVERLAP = 100
 
 
 class BlacklistedToken(db.Model):
-    """BlacklistedToken Model for storing JWT tokens."""
+    """BlacklistedToken Model for storing digests of revoked JWT tokens."""
 
     __tablename__ = "token_blacklist"
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    token = db.Column(db.String(500), unique=True, nullable=False)
+    token_digest = db.Column(db.String(64), unique=True, nullable=False)
     blacklisted_on = db.Column(db.DateTime, default=utc_now)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
 
     def __init__(self, token, expires_at):
-        self.token = token
+        self.token_digest = self.digest(token)
         self.expires_at = dtaware_fromtimestamp(expires_at, use_tz=timezone.utc)
 
     def __repr__(self):
-        return f"<BlacklistToken token={self.token}>"
+        return f"<BlacklistToken token_digest={self.token_digest}>"
+
+    digest = staticmethod(digest_token)
 
     @classmethod
     def check_blacklist(cls, token):
-        exists = cls.query.filter_by(token=token).first()
+        token_digest = cls.digest(token)
+        if blacklist_filter.enabled:
+            cls.refresh_filter()
+            if not blacklist_filter.might_contain(token_digest):
+                return False
+
+        exists = cls.query.filter_by(token_digest=token_digest).first()
+        if not exists and blacklist_filter.enabled:
+            blacklist_filter.false_positives += 1
         return True if exists else False
+
+    @classmethod
+    def refresh_filter(cls):
+        """Add tokens blacklisted since the last refresh (by any worker) to the filter."""
+        now = time.time()
+        if not blacklist_filter.needs_refresh(now):
+            return
+        if not blacklist_filter.loaded:
+            return cls.rebuild_filter()
+
+        min_id = blacklist_filter.last_id - FILTER_REFRESH_ID_OVERLAP
+        rows = db.session.query(cls.id, cls.token_digest).filter(cls.id > min_id)
+        for row_id, token_digest in rows:
+            blacklist_filter.add(token_digest, row_id)
+
+        if blacklist_filter.is_full():
+            return cls.rebuild_filter()
+        blacklist_filter.mark_refreshed(now)
+
+    @classmethod
+    def rebuild_filter(cls, capacity=None):
+        """Reload the filter from every row of the table, growing it if needed."""
+        now = time.time()
+        capacity = max(
+            capacity or blacklist_filter.initial_capacity, cls.query.count() * 2
+        )
+        blacklist_filter.reset(capacity)
+        rows = db.session.query(cls.id, cls.token_digest).yield_per(1000)
+        for row_id, token_digest in rows:
+            blacklist_filter.add(token_digest, row_id)
+        blacklist_filter.mark_refreshed(now)
+
+    @classmethod
+    def purge_expired(cls, batch_size=1000):
+        """Delete expired tokens, committing every batch_size rows."""
+        return purge_expired(cls, batch_size)
@@ -6,7 +6,8 @@ import jwt
 from flask import current_app
 from sqlalchemy.ext.hybrid import hybrid_property
 
-from flask_api import db, bcrypt
+from flask_api import db, bcrypt, hash_pool, token_cache, token_version_cache
+from flask_api.models.refresh_token import RefreshToken
 from flask_api.models.token_blacklist import BlacklistedToken
 from flask_api.util.datetime_util import (
     utc_now,
@@ -14,6 +15,7 @@ from flask_api.util.datetime_util import (
     make_tzaware,
     localized_dt_string,
 )
+from flask_api.util.hash_pool import HashPoolSaturated
 from flask_api.util.result import Result
 
 
@@ -28,6 +30,8 @@ class User(db.Model):
     registered_on = db.Column(db.DateTime, default=utc_now)
     admin = db.Column(db.Boolean, default=False)
     public_id = db.Column(db.String(36), unique=True, default=lambda: str(uuid4()))
+    # Embedded in access tokens, incrementing it revokes every token of the user.
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     def __repr__(self):
         return (
@@ -55,12 +59,49 @@ class User(db.Model):
     @password.setter
     def password(self, password):
         log_rounds = current_app.config.get("BCRYPT_LOG_ROUNDS")
-        hash_bytes = bcrypt.generate_password_hash(password, log_rounds)
+        hash_bytes = hash_pool.run(bcrypt.generate_password_hash, password, log_rounds)
         self.password_hash = hash_bytes.decode("utf-8")
 
     def check_password(self, password):
         """ Return True if passowrd match """
-        return bcrypt.check_password_hash(self.password_hash, password)
+        return hash_pool.run(bcrypt.check_password_hash, self.password_hash, password)
+
+    @property
+    def password_log_rounds(self):
+        """bcrypt cost factor stored in password_hash: $2b$<cost>$<salt+hash>."""
+        return int(self.password_hash.split("$")[2])
+
+    def needs_rehash(self):
+        log_rounds = current_app.config.get("BCRYPT_LOG_ROUNDS")
+        return self.password_log_rounds != log_rounds
+
+    def rehash_password(self, password):
+        """
+        Hash password again with the configured cost, in the background.
+        The update runs on its own connection and is skipped if the password
+        was changed meanwhile. If the hash pool is busy, the next login retries.
+        """
+        log_rounds = current_app.config.get("BCRYPT_LOG_ROUNDS")
+        engine = db.engine
+        update = (
+            User.__table__.update()
+            .where(User.id == self.id)
+            .where(User.password_hash == self.password_hash)
+        )
+
+        def save_password_hash(hash_bytes):
+            with engine.begin() as conn:
+                conn.execute(update.values(password_hash=hash_bytes.decode("utf-8")))
+
+        try:
+            hash_pool.submit(
+                bcrypt.generate_password_hash,
+                password,
+                log_rounds,
+                callback=save_password_hash,
+            )
+        except HashPoolSaturated:
+            pass
 
     @classmethod
     def find_by_email(cls, email):
@@ -70,6 +111,29 @@ class User(db.Model):
     def find_by_public_id(cls, public_id):
         return cls.query.filter_by(public_id=public_id).first()
 
+    @classmethod
+    def get_token_version(cls, public_id):
+        """Current token_version of a user (None if deleted), cached per process."""
+        token_version = token_version_cache.get(public_id)
+        if token_version is None:
+            row = (
+                db.session.query(cls.token_version)
+                .filter_by(public_id=public_id)
+                .first()
+            )
+            if not row:
+                return None
+            token_version = row.token_version
+            token_version_cache.set(public_id, token_version)
+        return token_version
+
+    def revoke_all_tokens(self):
+        """Invalidate every access and refresh token of this user (caller commits)."""
+        User.query.filter_by(id=self.id).update(
+            {User.token_version: User.token_version + 1}, synchronize_session=False
+        )
+        RefreshToken.revoke_all(self.id)
+
     def encode_access_token(self):
         now = datetime.now(timezone.utc)
         token_age_h = current_app.config.get("TOKEN_EXPIRE_HOURS")
@@ -79,7 +143,13 @@ class User(db.Model):
         if current_app.config["TESTING"]:
             expire = now + timedelta(seconds=5)
 
-        payload = dict(exp=expire, iat=now, sub=self.public_id, admin=self.admin)
+        payload = dict(
+            exp=expire,
+            iat=now,
+            sub=self.public_id,
+            admin=self.admin,
+            ver=self.token_version,
+        )
         key = current_app.config.get("SECRET_KEY")
 
         return jwt.encode(payload, key, algorithm="HS256")
@@ -93,6 +163,27 @@ class User(db.Model):
             split = access_token.split("Bearer")
             access_token = split[1].strip()
 
+        # Signature and blacklist were already checked for this exact token.
+        cached_token = token_cache.get(access_token)
+        if cached_token:
+            user_dict, token_version = cached_token
+        else:
+            result = User._verify_access_token(access_token)
+            if result.failure:
+                return result
+            user_dict, token_version = result.value
+            token_cache.set(
+                access_token, result.value, expires_at=user_dict["expires_at"]
+            )
+
+        if token_version != User.get_token_version(user_dict["public_id"]):
+            error = "Token revoked. Please log in again."
+            return Result.Fail(error)
+
+        return Result.Ok(dict(user_dict))
+
+    @staticmethod
+    def _verify_access_token(access_token):
         try:
             key = current_app.config.get("SECRET_KEY")
             payload = jwt.decode(access_token, key, algorithms=["HS256"])
@@ -115,5 +206,5 @@ class User(db.Model):
             token=access_token,
             expires_at=payload["exp"],
         )
-
-        return Result.Ok(user_dict)
+        # Tokens issued before token_version existed are version 0.
+        return Result.Ok((user_dict, payload.get("ver", 0)))
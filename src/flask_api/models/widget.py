@@ -21,10 +21,15 @@ class Widget(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
     info_url = db.Column(db.String(255))
-    created_at = db.Column(db.DateTime, default=utc_now)
-    deadline = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=utc_now, index=True)
+    deadline = db.Column(db.DateTime, index=True)
+    # Incremented on every update, ETags and Last-Modified are derived from these.
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    updated_at = db.Column(db.DateTime, default=utc_now, onupdate=utc_now)
 
-    owner_id = db.Column(db.Integer, db.ForeignKey("site_user.id"), nullable=False)
+    owner_id = db.Column(
+        db.Integer, db.ForeignKey("site_user.id"), nullable=False, index=True
+    )
     owner = db.relationship("User", backref=db.backref("widgets"))
 
     def __repr__(self):
@@ -46,6 +51,11 @@ class Widget(db.Model):
     def deadline_passed(self):
         return datetime.now(timezone.utc) > self.deadline.replace(tzinfo=timezone.utc)
 
+    @deadline_passed.expression
+    def deadline_passed(cls):
+        # Datetimes are stored as naive UTC values.
+        return cls.deadline < datetime.now(timezone.utc).replace(tzinfo=None)
+
     @hybrid_property
     def time_remaining(self):
         time_remaining = self.deadline.replace(tzinfo=timezone.utc) - utc_now()
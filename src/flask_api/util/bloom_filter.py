@@ -0,0 +1,114 @@
+"""Probabilistic set membership for fast negative lookups."""
+import math
+from hashlib import blake2b
+from threading import Lock
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for a capacity and false positive rate.
+
+    A negative answer is always correct, a positive answer is wrong with
+    probability error_rate as long as no more than capacity keys are added.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def __contains__(self, key):
+        return all(self._bits[i >> 3] & (1 << (i & 7)) for i in self._bit_positions(key))
+
+    def add(self, key):
+        for i in self._bit_positions(key):
+            self._bits[i >> 3] |= 1 << (i & 7)
+        self.count += 1
+
+    def _bit_positions(self, key):
+        # Kirsch-Mitzenmacher: k positions derived from two 64-bit hashes.
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+
+class SyncedBloomFilter:
+    """Bloom filter mirroring a database table that is only ever appended to.
+
+    The owner of the table is responsible for loading rows: ``needs_refresh``
+    tells it when to look for rows newer than ``last_id`` (or to rebuild
+    everything when ``loaded`` is False), and each row is passed to ``add``.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.configure(enabled=False, capacity=1000, error_rate=0.01)
+
+    def configure(self, enabled, capacity, error_rate, refresh_interval=0):
+        """Change the filter settings, the filter is rebuilt on next use."""
+        self.enabled = enabled
+        self.initial_capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.reset()
+
+    def reset(self, capacity=None):
+        """Discard all keys, optionally growing the filter."""
+        with self._lock:
+            self._filter = BloomFilter(
+                capacity or self.initial_capacity, self.error_rate
+            )
+            self.loaded = False
+            self.last_id = 0
+            self.last_refresh = 0
+            self.negatives = 0
+            self.positives = 0
+            self.false_positives = 0
+
+    def needs_refresh(self, now):
+        return not self.loaded or now - self.last_refresh >= self.refresh_interval
+
+    def is_full(self):
+        return self._filter.count >= self._filter.capacity
+
+    @property
+    def capacity(self):
+        return self._filter.capacity
+
+    def add(self, key, row_id=None):
+        """Add key; pass row_id only for rows read back from the database."""
+        with self._lock:
+            if key not in self._filter:
+                self._filter.add(key)
+            if row_id is not None and row_id > self.last_id:
+                self.last_id = row_id
+
+    def mark_refreshed(self, now):
+        self.loaded = True
+        self.last_refresh = now
+
+    def might_contain(self, key):
+        """False means key is definitely absent, True means check the database."""
+        if key in self._filter:
+            self.positives += 1
+            return True
+        self.negatives += 1
+        return False
+
+    def stats(self):
+        return dict(
+            enabled=self.enabled,
+            capacity=self._filter.capacity,
+            count=self._filter.count,
+            error_rate=self.error_rate,
+            size_bytes=len(self._filter._bits),
+            hashes=self._filter.num_hashes,
+            negatives=self.negatives,
+            positives=self.positives,
+            false_positives=self.false_positives,
+        )
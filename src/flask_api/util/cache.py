@@ -0,0 +1,109 @@
+"""Bounded in-memory cache with per-entry expiration and hit/miss counters."""
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries also expire after a fixed time.
+
+    Each process (gunicorn worker) holds its own instance, so anything stored
+    here can be up to ``ttl`` seconds out of date compared to other workers.
+    With ``maxbytes``, the sizes passed to ``set`` must also add up to no more
+    than maxbytes.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, maxbytes=None):
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.configure(maxsize, ttl, maxbytes)
+
+    def __len__(self):
+        return len(self._data)
+
+    def configure(self, maxsize, ttl, maxbytes=None):
+        """Change the size limits and lifetime of entries, and empty the cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.clear()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._lookup(key, time.time())
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, expires_at=None, size=0):
+        """Store value, expiring after ttl seconds or at expires_at (if sooner).
+
+        size is the (approximate) memory used by value, counted against maxbytes.
+        """
+        if not self.maxsize or (self.maxbytes is not None and size > self.maxbytes):
+            return
+        expiry = time.time() + self.ttl
+        if expires_at is not None:
+            expiry = min(expiry, expires_at)
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (value, expiry, size)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.bytes > self.maxbytes
+            ):
+                self.bytes -= self._data.popitem(last=False)[1][2]
+                self.evictions += 1
+
+    def pop(self, key):
+        """Remove key from the cache immediately, if present."""
+        with self._lock:
+            self._remove(key)
+
+    def invalidate(self):
+        """Remove all entries, keeping the counters."""
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Current size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+        return dict(
+            size=len(self._data),
+            maxsize=self.maxsize,
+            bytes=self.bytes,
+            maxbytes=self.maxbytes,
+            ttl=self.ttl,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_ratio=round(self.hits / lookups, 4) if lookups else 0.0,
+        )
+
+    def _lookup(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            self._remove(key)
+            return None
+        return entry
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
@@ -0,0 +1,110 @@
+"""gzip compression of responses, negotiated with the Accept-Encoding header."""
+import zlib
+
+from flask import request
+
+DEFAULT_MIMETYPES = ("application/json", "application/x-ndjson", "text/csv")
+
+
+class Compression:
+    """Compress responses with gzip from an after_request handler.
+
+    Responses are compressed when the client accepts gzip, the mimetype is one
+    of mimetypes and the body is at least min_size bytes. Streamed responses
+    are compressed chunk by chunk, each chunk is flushed so clients still
+    receive data as it is produced. no-store responses (tokens) are skipped.
+    """
+
+    def __init__(self):
+        self.configure(enabled=False, level=6, min_size=1024)
+
+    def init_app(self, app):
+        self.configure(
+            enabled=app.config.get("COMPRESS_ENABLED"),
+            level=app.config.get("COMPRESS_LEVEL"),
+            min_size=app.config.get("COMPRESS_MIN_SIZE"),
+            mimetypes=app.config.get("COMPRESS_MIMETYPES"),
+        )
+        app.after_request(self.after_request)
+
+    def configure(self, enabled, level, min_size, mimetypes=DEFAULT_MIMETYPES):
+        if not 0 <= level <= 9:
+            raise ValueError(f"Invalid compression level: {level}, use 0 to 9")
+        self.enabled = enabled
+        self.level = level
+        self.min_size = min_size
+        self.mimetypes = frozenset(mimetypes)
+        self.compressed = 0
+        self.streamed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def after_request(self, response):
+        if not self._should_compress(response):
+            return response
+        if response.is_streamed:
+            response.response = self._compress_stream(response.response)
+            response.headers.pop("Content-Length", None)
+            self.streamed += 1
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            compressed = self._compressor()
+            response.set_data(compressed.compress(data) + compressed.flush())
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += response.content_length
+        response.headers["Content-Encoding"] = "gzip"
+        # The compressed body is a different representation of the resource,
+        # a weak ETag still matches If-None-Match (weak comparison).
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def stats(self):
+        ratio = self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+        return dict(
+            enabled=self.enabled,
+            level=self.level,
+            min_size=self.min_size,
+            compressed=self.compressed,
+            streamed=self.streamed,
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+            ratio=round(ratio, 4),
+        )
+
+    def _should_compress(self, response):
+        if (
+            not self.enabled
+            or response.mimetype not in self.mimetypes
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.cache_control.no_store
+        ):
+            return False
+        # Responses that could be compressed differ by Accept-Encoding, whether
+        # or not this one is.
+        response.vary.add("Accept-Encoding")
+        return request.accept_encodings["gzip"] > 0
+
+    def _compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def _compress_stream(self, chunks):
+        compressed = self._compressor()
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                data = compressed.compress(chunk) + compressed.flush(zlib.Z_SYNC_FLUSH)
+                if data:
+                    yield data
+            yield compressed.flush()
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
@@ -0,0 +1,54 @@
+"""Helpers for database keys, maintenance and errors."""
+import time
+from collections import namedtuple
+from hashlib import sha256
+
+from flask import current_app
+
+from flask_api import db
+from flask_api.util.datetime_util import utc_now
+
+purge_result = namedtuple("purge_result", ["deleted", "elapsed"])
+
+
+def digest_token(token):
+    """Fixed-length key for a token, SHA-256 as 64 hex characters."""
+    return sha256(token.encode()).hexdigest()
+
+
+def purge_expired(model, batch_size=1000):
+    """Delete rows of model past expires_at, committing every batch_size rows."""
+    start = time.perf_counter()
+    now = utc_now().replace(tzinfo=None)
+    deleted = 0
+    while True:
+        expired = model.query.with_entities(model.id).filter(model.expires_at < now)
+        expired_ids = [row_id for (row_id,) in expired.limit(batch_size)]
+        if not expired_ids:
+            break
+        model.query.filter(model.id.in_(expired_ids)).delete(synchronize_session=False)
+        db.session.commit()
+        deleted += len(expired_ids)
+        if len(expired_ids) < batch_size:
+            break
+
+    result = purge_result(deleted, time.perf_counter() - start)
+    current_app.logger.info(
+        f"Purged {result.deleted} expired rows from {model.__tablename__} "
+        f"in {result.elapsed:.3f} seconds"
+    )
+    return result
+
+
+def is_unique_violation(error, column):
+    """True if the IntegrityError error was raised by the UNIQUE constraint on column.
+
+    Matches the messages of SQLite and MySQL ("site_user.email") and the default
+    constraint name of PostgreSQL ("site_user_email_key").
+    """
+    table_name, column_name = column.table.name, column.name
+    message = str(error.orig)
+    return (
+        f"{table_name}.{column_name}" in message
+        or f"{table_name}_{column_name}_key" in message
+    )
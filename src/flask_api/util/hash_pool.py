@@ -0,0 +1,150 @@
+"""Bounded worker pool for CPU-heavy password hashing."""
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Lock
+
+try:
+    from gevent import monkey
+    from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+except ImportError:
+    monkey = None
+
+POOL_TYPES = ("inline", "thread", "process")
+
+
+class HashPoolSaturated(Exception):
+    """Raised instead of queueing work when the hash pool is full."""
+
+
+class HashPool:
+    """Run functions on a thread or process pool, refusing work beyond a queue limit.
+
+    With pool_type="inline" (or size 0) functions run in the calling thread.
+    Under gevent, "thread" uses real OS threads so that hashing does not block
+    the event loop. Executors are created on first use, after gunicorn forks.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._lock = Lock()
+        self.configure(pool_type="inline", size=0, queue_limit=0, timeout=None)
+
+    def configure(self, pool_type, size, queue_limit, timeout):
+        if pool_type not in POOL_TYPES:
+            raise ValueError(f"Invalid pool type: {pool_type}, use one of {POOL_TYPES}")
+        self.shutdown()
+        self.pool_type = pool_type
+        self.size = size
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def enabled(self):
+        return self.pool_type != "inline" and self.size > 0
+
+    @property
+    def queue_depth(self):
+        """Number of jobs waiting for a free worker."""
+        return max(0, self.in_flight - self.size)
+
+    def run(self, func, *args):
+        """Run func(*args) on the pool and wait for its result."""
+        if not self.enabled:
+            return func(*args)
+        future = self._submit(func, args)
+        try:
+            return future.result(timeout=self.timeout)[1]
+        except FutureTimeoutError:
+            self.timed_out += 1
+            raise HashPoolSaturated("Timed out waiting for a password hashing worker")
+
+    def submit(self, func, *args, callback=None):
+        """Run func(*args) on the pool without waiting, pass its result to callback.
+
+        The callback runs in a pool (or pool management) thread.
+        """
+        if not self.enabled:
+            result = func(*args)
+            if callback:
+                callback(result)
+            return
+
+        def on_done(future):
+            if not future.cancelled() and not future.exception():
+                callback(future.result()[1])
+
+        future = self._submit(func, args)
+        if callback:
+            future.add_done_callback(on_done)
+
+    def shutdown(self):
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self):
+        avg_wait = self.total_wait / self.completed if self.completed else 0.0
+        return dict(
+            pool_type=self.pool_type,
+            size=self.size,
+            queue_limit=self.queue_limit,
+            in_flight=self.in_flight,
+            queue_depth=self.queue_depth,
+            max_queue_depth=self.max_queue_depth,
+            completed=self.completed,
+            rejected=self.rejected,
+            timed_out=self.timed_out,
+            avg_wait_ms=round(avg_wait * 1000, 3),
+            max_wait_ms=round(self.max_wait * 1000, 3),
+        )
+
+    def _submit(self, func, args):
+        with self._lock:
+            if self.in_flight >= self.size + self.queue_limit:
+                self.rejected += 1
+                raise HashPoolSaturated("Too many password hashing requests in progress")
+            self.in_flight += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            executor = self._get_executor()
+        try:
+            future = executor.submit(_timed_call, time.time(), func, *args)
+        except Exception:
+            self._job_done(None)
+            raise
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            if future is None or future.cancelled() or future.exception():
+                return
+            wait = future.result()[0]
+            self.completed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def _get_executor(self):
+        if not self._executor:
+            if self.pool_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.size)
+            elif monkey and monkey.is_module_patched("threading"):
+                self._executor = NativeThreadPoolExecutor(max_workers=self.size)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.size, thread_name_prefix="hash-pool"
+                )
+        return self._executor
+
+
+def _timed_call(submitted_at, func, *args):
+    """Return the time spent waiting for a worker along with the result of func."""
+    return time.time() - submitted_at, func(*args)
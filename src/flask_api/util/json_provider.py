@@ -0,0 +1,85 @@
+"""JSON encoding for API responses, using orjson when it is installed."""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_ENCODERS = ("auto", "orjson", "json")
+
+
+class JSONProvider:
+    """Encode response bodies with orjson or the stdlib json module.
+
+    Both encoders give the same output: UTF-8 without escaping non-ASCII
+    characters, dict key order kept (unless sort_keys is set) and datetime,
+    date and time objects written as ISO 8601 strings.
+    """
+
+    def __init__(self):
+        self.configure(encoder="auto")
+
+    def configure(self, encoder, sort_keys=False):
+        """Select the encoder, "auto" uses orjson if available and json otherwise."""
+        if encoder not in JSON_ENCODERS:
+            raise ValueError(
+                f"Invalid JSON encoder: {encoder}, use one of {JSON_ENCODERS}"
+            )
+        if encoder == "orjson" and not orjson:
+            raise ValueError("JSON encoder orjson is not installed")
+        if encoder == "auto":
+            encoder = "orjson" if orjson else "json"
+        self.encoder = encoder
+        self.sort_keys = sort_keys
+        if encoder == "orjson":
+            self._options = orjson.OPT_NON_STR_KEYS
+            if sort_keys:
+                self._options |= orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj):
+        """Encode obj as compact JSON, returning bytes."""
+        if self.encoder == "orjson":
+            return orjson.dumps(obj, default=_default, option=self._options)
+        return json.dumps(
+            obj,
+            default=_default,
+            separators=(",", ":"),
+            sort_keys=self.sort_keys,
+            ensure_ascii=False,
+        ).encode()
+
+    def jsonify(self, *args, **kwargs):
+        """Same as flask.jsonify, encoding the response with dumps."""
+        if args and kwargs:
+            raise TypeError(
+                "jsonify() behavior undefined when passed both args and kwargs"
+            )
+        data = args[0] if len(args) == 1 else args or kwargs
+        return current_app.response_class(
+            self.dumps(data) + b"\n", mimetype=current_app.config["JSONIFY_MIMETYPE"]
+        )
+
+    def output_json(self, data, code, headers=None):
+        """Flask-RESTx representation for application/json."""
+        response = make_response(self.dumps(data) + b"\n", code)
+        response.headers.extend(headers or {})
+        return response
+
+
+def _default(obj):
+    """Encode objects that json (or orjson) can't encode by itself."""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    if isinstance(obj, tuple):
+        return list(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,22 @@
+"""Run a function at a fixed interval in a background thread."""
+from threading import Event, Thread
+
+
+def run_periodically(app, interval, func, *args, **kwargs):
+    """Call func every interval seconds within an app context, return a stop Event.
+
+    Under gunicorn --preload this runs once, in the master process, since
+    forked workers do not inherit threads.
+    """
+    stop = Event()
+
+    def loop():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    func(*args, **kwargs)
+                except Exception:
+                    app.logger.exception(f"Periodic task {func.__name__} failed")
+
+    Thread(target=loop, name=f"periodic-{func.__name__}", daemon=True).start()
+    return stop
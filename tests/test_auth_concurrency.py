@@ -0,0 +1,83 @@
+"""Concurrent requests must each see the claims of their own access token."""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+from flask import g
+
+from flask_api.api.auth.decorators import token_required
+from tests.util import PASSWORD, register_user
+
+USERS = 8
+REQUESTS_PER_USER = 25
+
+
+@token_required
+def get_public_id_after_io():
+    time.sleep(0.001)
+    return g.token_payload.public_id
+
+
+def register_users(client):
+    tokens = {}
+    for i in range(USERS):
+        email = f"user{i}@email.com"
+        response = register_user(client, email=email, password=PASSWORD)
+        assert response.status_code == HTTPStatus.CREATED
+        tokens[email] = response.json["access_token"]
+    return tokens
+
+
+def run_concurrently(func, args):
+    # Switch threads as often as possible to widen any race between requests.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=USERS) as executor:
+            return list(executor.map(func, args))
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def test_no_claim_bleed_between_concurrent_requests(app, client, db):
+    tokens = register_users(client)
+    barrier = Barrier(USERS)
+
+    def get_user_repeatedly(email):
+        test_client = app.test_client()
+        headers = {"Authorization": f"Bearer {tokens[email]}"}
+        barrier.wait()
+        emails = []
+        for _ in range(REQUESTS_PER_USER):
+            response = test_client.get("/api/v1/auth/user", headers=headers)
+            assert response.status_code == HTTPStatus.OK
+            emails.append(response.json["email"])
+        return email, emails
+
+    for email, emails in run_concurrently(get_user_repeatedly, tokens):
+        assert emails == [email] * REQUESTS_PER_USER
+
+
+def test_no_claim_bleed_across_io(app, client, db):
+    tokens = register_users(client)
+    public_ids = {}
+    for email, access_token in tokens.items():
+        headers = {"Authorization": f"Bearer {access_token}"}
+        with app.test_request_context(headers=headers):
+            public_ids[email] = get_public_id_after_io()
+    barrier = Barrier(USERS)
+
+    def call_repeatedly(email):
+        headers = {"Authorization": f"Bearer {tokens[email]}"}
+        barrier.wait()
+        seen = []
+        for _ in range(REQUESTS_PER_USER):
+            with app.test_request_context(headers=headers):
+                seen.append(get_public_id_after_io())
+        return email, seen
+
+    for email, seen in run_concurrently(call_repeatedly, tokens):
+        assert seen == [public_ids[email]] * REQUESTS_PER_USER
+    assert len(set(public_ids.values())) == USERS
@@ -1,8 +1,10 @@
 """Unit tests for api.auth_login API endpoint."""
+import time
 from http import HTTPStatus
 
+from flask_api import bcrypt
 from flask_api.models.user import User
-from tests.util import EMAIL, register_user, login_user
+from tests.util import EMAIL, PASSWORD, register_user, login_user
 
 SUCCESS = "successfully logged in"
 UNAUTHORIZED = "email or password does not match"
@@ -30,3 +32,19 @@ def test_login_email_does_not_exist(client, db):
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert "message" in response.json and response.json["message"] == UNAUTHORIZED
     assert "access_token" not in response.json
+
+
+def test_login_rehashes_password(client, db, user):
+    user.password_hash = bcrypt.generate_password_hash(PASSWORD, 5).decode("utf-8")
+    db.session.commit()
+    assert user.needs_rehash()
+
+    response = login_user(client)
+    assert response.status_code == HTTPStatus.OK
+    for _ in range(50):
+        db.session.expire_all()
+        if not user.needs_rehash():
+            break
+        time.sleep(0.05)
+    assert user.password_log_rounds == 4
+    assert user.check_password(PASSWORD)
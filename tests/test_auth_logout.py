@@ -27,7 +27,7 @@ def test_logout(client, db):
 
     blacklist = BlacklistedToken.query.all()
     assert len(blacklist) == 1
-    assert access_token == blacklist[0].token
+    assert BlacklistedToken.digest(access_token) == blacklist[0].token_digest
 
 
 def test_logout_token_blacklisted(client, db):
@@ -0,0 +1,57 @@
+"""Unit tests for api.auth_logout_all API endpoint."""
+from http import HTTPStatus
+
+from flask_api import token_version_cache
+from flask_api.models.token_blacklist import BlacklistedToken
+from flask_api.models.user import User
+from tests.util import (
+    EMAIL,
+    register_user,
+    login_user,
+    get_user,
+    logout_all,
+    refresh_access_token,
+)
+
+SUCCESS = "successfully logged out everywhere"
+TOKEN_REVOKED = "Token revoked. Please log in again."
+
+
+def test_logout_all(client, db):
+    response = register_user(client)
+    first_token = response.json["access_token"]
+    refresh_token = response.json["refresh_token"]
+    response = login_user(client)
+    second_token = response.json["access_token"]
+
+    response = logout_all(client, second_token)
+    assert response.status_code == HTTPStatus.OK
+    assert "message" in response.json and response.json["message"] == SUCCESS
+    assert User.find_by_email(EMAIL).token_version == 1
+    assert BlacklistedToken.query.count() == 0
+
+    for access_token in (first_token, second_token):
+        response = get_user(client, access_token)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.json["message"] == TOKEN_REVOKED
+    response = refresh_access_token(client, refresh_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    response = login_user(client)
+    response = get_user(client, response.json["access_token"])
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_token_version_cached(user):
+    access_token = user.encode_access_token()
+    assert User.decode_access_token(access_token).success
+    assert User.decode_access_token(access_token).success
+    assert token_version_cache.stats()["hits"] == 1
+
+    # Without invalidation another worker keeps accepting the token until
+    # its cached version expires.
+    User.query.filter_by(id=user.id).update({User.token_version: 5})
+    assert User.decode_access_token(access_token).success
+    token_version_cache.pop(user.public_id)
+    result = User.decode_access_token(access_token)
+    assert not result.success and result.error == TOKEN_REVOKED
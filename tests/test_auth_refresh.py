@@ -0,0 +1,99 @@
+"""Unit tests for api.auth_refresh API endpoint."""
+from datetime import timedelta
+from http import HTTPStatus
+
+from flask import url_for
+
+from flask_api.models.refresh_token import RefreshToken
+from tests.util import EMAIL, register_user, login_user, get_user, refresh_access_token
+
+SUCCESS = "successfully refreshed"
+INVALID = "refresh token invalid or expired"
+REUSED = "refresh token already used, please log in again"
+
+
+def test_refresh(client, db):
+    register_user(client)
+    response = login_user(client)
+    assert "refresh_token" in response.json and "refresh_expires_in" in response.json
+    refresh_token = response.json["refresh_token"]
+
+    response = refresh_access_token(client, refresh_token)
+    assert response.status_code == HTTPStatus.OK
+    assert "message" in response.json and response.json["message"] == SUCCESS
+    assert "access_token" in response.json
+    assert response.json["refresh_token"] != refresh_token
+    assert response.headers["Cache-Control"] == "no-store"
+
+    response = get_user(client, response.json["access_token"])
+    assert response.status_code == HTTPStatus.OK
+    assert "email" in response.json and response.json["email"] == EMAIL
+
+
+def test_refresh_token_reused(client, db):
+    response = register_user(client)
+    refresh_token = response.json["refresh_token"]
+    response = refresh_access_token(client, refresh_token)
+    assert response.status_code == HTTPStatus.OK
+    rotated_token = response.json["refresh_token"]
+
+    response = refresh_access_token(client, refresh_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert "message" in response.json and response.json["message"] == REUSED
+
+    # Reuse revokes the whole token family, including the rotated token.
+    response = refresh_access_token(client, rotated_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_refresh_token_invalid(client, db):
+    response = refresh_access_token(client, "not-a-refresh-token")
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert "message" in response.json and response.json["message"] == INVALID
+    assert "access_token" not in response.json
+
+
+def test_refresh_token_expired(client, db):
+    response = register_user(client)
+    refresh_token = response.json["refresh_token"]
+    stored_token = RefreshToken.find_by_token(refresh_token)
+    stored_token.expires_at -= timedelta(days=31)
+    db.session.commit()
+
+    response = refresh_access_token(client, refresh_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert "message" in response.json and response.json["message"] == INVALID
+
+
+def test_logout_revokes_refresh_token(client, db):
+    response = register_user(client)
+    access_token = response.json["access_token"]
+    refresh_token = response.json["refresh_token"]
+    response = client.post(
+        url_for("api.auth_logout"),
+        headers={"Authorization": f"Bearer {access_token}"},
+        data=f"refresh_token={refresh_token}",
+        content_type="application/x-www-form-urlencoded",
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert RefreshToken.find_by_token(refresh_token).revoked_on
+
+    response = refresh_access_token(client, refresh_token)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_purge_expired_refresh_tokens(client, db):
+    response = register_user(client)
+    refresh_token = response.json["refresh_token"]
+    response = refresh_access_token(client, refresh_token)
+    rotated_token = response.json["refresh_token"]
+    # Used and expired, only the unexpired token is kept.
+    stored_token = RefreshToken.find_by_token(refresh_token)
+    stored_token.expires_at -= timedelta(days=31)
+    db.session.commit()
+
+    result = RefreshToken.purge_expired(batch_size=1)
+    assert result.deleted == 1
+    assert RefreshToken.find_by_token(refresh_token) is None
+    assert RefreshToken.find_by_token(rotated_token)
+    assert RefreshToken.purge_expired().deleted == 0
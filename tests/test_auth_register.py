@@ -2,7 +2,7 @@
 from http import HTTPStatus
 
 from flask_api.models.user import User
-from tests.util import EMAIL, PASSWORD, BAD_REQUEST, register_user
+from tests.util import EMAIL, PASSWORD, BAD_REQUEST, count_queries, register_user
 
 SUCCESS = "successfully registered"
 EMAIL_ALREADY_EXISTS = f"{EMAIL} is already registered"
@@ -42,6 +42,21 @@ def test_auth_register_email_already_registered(client, db):
     assert "access_token" not in response.json
 
 
+def test_auth_register_no_email_lookup(client, db):
+    with count_queries(db.engine) as statements:
+        response = register_user(client)
+    assert response.status_code == HTTPStatus.CREATED
+    assert not [s for s in statements if s.startswith("SELECT")]
+
+    db.session.remove()
+    with count_queries(db.engine) as statements:
+        response = register_user(client)
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json["message"] == EMAIL_ALREADY_EXISTS
+    assert [s.split()[0] for s in statements] == ["INSERT"]
+    assert User.query.count() == 1
+
+
 def test_auth_register_invalid_email(client):
     invalid_email = "first last"
     response = register_user(client, email=invalid_email)
@@ -0,0 +1,46 @@
+"""Unit tests for the Bloom filter in front of the token blacklist."""
+import time
+
+from flask_api import blacklist_filter
+from flask_api.models.token_blacklist import BlacklistedToken
+from flask_api.util.bloom_filter import BloomFilter
+
+
+def test_bloom_filter_no_false_negatives():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for i in range(5000):
+        bloom.add(f"token-{i}")
+    assert all(f"token-{i}" in bloom for i in range(5000))
+
+    false_positives = sum(f"other-{i}" in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.02
+
+
+def test_check_blacklist_negative_skips_lookup(db):
+    assert not BlacklistedToken.check_blacklist("not-a-blacklisted-token")
+    stats = blacklist_filter.stats()
+    assert stats["negatives"] == 1 and stats["positives"] == 0
+
+
+def test_check_blacklist_token_added_by_other_worker(db):
+    expires_at = int(time.time()) + 60
+    assert not BlacklistedToken.check_blacklist("revoked-token")
+
+    # Rows written by another process only reach the filter on refresh.
+    db.session.add(BlacklistedToken("revoked-token", expires_at))
+    db.session.commit()
+    blacklist_filter.refresh_interval = 0
+    assert BlacklistedToken.check_blacklist("revoked-token")
+    assert blacklist_filter.stats()["positives"] == 1
+
+
+def test_rebuild_filter_grows_capacity(db):
+    expires_at = int(time.time()) + 60
+    for i in range(10):
+        db.session.add(BlacklistedToken(f"revoked-{i}", expires_at))
+    db.session.commit()
+
+    BlacklistedToken.rebuild_filter(capacity=4)
+    assert blacklist_filter.capacity == 20
+    assert blacklist_filter.stats()["count"] == 10
+    assert all(BlacklistedToken.check_blacklist(f"revoked-{i}") for i in range(10))
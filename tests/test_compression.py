@@ -0,0 +1,104 @@
+"""Test cases for gzip compression of responses."""
+import gzip
+import json
+from http import HTTPStatus
+
+from flask import url_for
+
+from flask_api import compression
+from tests.util import (
+    ADMIN_EMAIL,
+    add_widgets,
+    export_widgets,
+    login_user,
+    retrieve_metrics,
+    retrieve_widget,
+    retrieve_widget_list,
+)
+
+GZIP = {"Accept-Encoding": "gzip, deflate"}
+
+
+def _get(client, access_token, endpoint, headers=None, **params):
+    headers = dict(headers or {}, Authorization=f"Bearer {access_token}")
+    return client.get(url_for(endpoint, **params), headers=headers)
+
+
+def test_widget_list_compressed(client, db, admin):
+    add_widgets(db, admin, 20)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    plain = retrieve_widget_list(client, access_token, per_page=25)
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    response = _get(client, access_token, "api.widget_list", GZIP, per_page=25)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert response.content_length == len(response.data) < len(plain.data)
+    assert json.loads(gzip.decompress(response.data)) == plain.json
+
+    etag, weak = response.get_etag()
+    assert weak
+    assert etag == plain.get_etag()[0]
+    headers = dict(GZIP, **{"If-None-Match": response.headers["ETag"]})
+    response = _get(client, access_token, "api.widget_list", headers, per_page=25)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    stats = retrieve_metrics(client, access_token).json["compression"]
+    assert stats["compressed"] == 1
+    assert stats["bytes_in"] == len(plain.data)
+    assert stats["bytes_out"] < stats["bytes_in"]
+
+
+def test_compression_refused_by_client(client, db, admin):
+    add_widgets(db, admin, 20)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    for accept_encoding in ("gzip;q=0", "identity", "br"):
+        response = _get(
+            client,
+            access_token,
+            "api.widget_list",
+            {"Accept-Encoding": accept_encoding},
+            per_page=25,
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert "Content-Encoding" not in response.headers
+        assert response.json["items"]
+
+
+def test_small_and_no_store_responses_not_compressed(client, db, admin):
+    add_widgets(db, admin, 1)
+    response = client.post(
+        url_for("api.auth_login"),
+        data=f"email={ADMIN_EMAIL}&password=test1234",
+        content_type="application/x-www-form-urlencoded",
+        headers=GZIP,
+    )
+    access_token = response.json["access_token"]
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "Content-Encoding" not in response.headers
+
+    response = _get(client, access_token, "api.widget", GZIP, name="widget000")
+    assert len(response.data) < compression.min_size
+    assert "Content-Encoding" not in response.headers
+
+    compression.min_size = 0
+    response = _get(client, access_token, "api.widget", GZIP, name="widget000")
+    assert response.headers["Content-Encoding"] == "gzip"
+    plain = retrieve_widget(client, access_token, widget_name="widget000")
+    assert json.loads(gzip.decompress(response.data)) == plain.json
+
+
+def test_export_stream_compressed(client, db, admin):
+    add_widgets(db, admin, 50)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    plain = export_widgets(client, access_token)
+    response = _get(client, access_token, "api.widget_export", GZIP, format="csv")
+    assert response.is_streamed
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(response.data).decode().count("\n") == 51
+
+    response = _get(client, access_token, "api.widget_export", GZIP)
+    assert gzip.decompress(response.data) == plain.data
@@ -8,6 +8,7 @@ from tests.util import (
     EMAIL,
     ADMIN_EMAIL,
     BAD_REQUEST,
+    count_queries,
     FORBIDDEN,
     DEFAULT_NAME,
     login_user,
@@ -32,6 +33,15 @@ def test_create_widget_valid_name(client, db, admin, widget_name):
     assert "Location" in response.headers and response.headers["Location"] == location
 
 
+@pytest.mark.parametrize("widget_name", ["export", "Export"])
+def test_create_widget_reserved_name(client, db, admin, widget_name):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    response = create_widget(client, access_token, widget_name=widget_name)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "message" in response.json and response.json["message"] == BAD_REQUEST
+    assert "errors" in response.json and "name" in response.json["errors"]
+
+
 @pytest.mark.parametrize(
     "deadline_str",
     [
@@ -83,8 +93,11 @@ def test_create_widget_already_exists(client, db, admin):
     response = create_widget(client, access_token)
     assert response.status_code == HTTPStatus.CREATED
 
-    response = create_widget(client, access_token)
+    with count_queries(db.engine) as statements:
+        response = create_widget(client, access_token)
     assert response.status_code == HTTPStatus.CONFLICT
+    # No SELECT before the INSERT, the unique constraint on name fails it.
+    assert [s.split()[0] for s in statements] == ["INSERT"]
 
     name_conflict = f"Widget name: {DEFAULT_NAME} already exists, must be unique."
     assert "message" in response.json and response.json["message"] == name_conflict
@@ -0,0 +1,64 @@
+"""Test cases for parsing widget deadlines."""
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from dateutil import parser
+from flask import g
+
+from flask_api.api.widgets import dto
+from flask_api.api.widgets.dto import future_date_from_string, iso_date
+
+FUTURE = date.today() + timedelta(days=3)
+
+
+@pytest.mark.parametrize(
+    "date_str",
+    [
+        "2030-05-13",
+        "2030-05-13T14:30",
+        "2030-05-13T14:30:59",
+        "2030-05-13 14:30:59.123456",
+        "2030-05-13T23:59:59Z",
+        "2030-05-13T00:00:00-08:00",
+        "2030-05-13T00:00:00+0530",
+    ],
+)
+def test_iso_date_same_as_dateutil(date_str):
+    assert iso_date(date_str) == parser.parse(date_str).date()
+
+
+@pytest.mark.parametrize(
+    "date_str",
+    ["2030-5-13", "05/13/2030", "May 13 2030", "2030-02-30", "2030-05-13T24:00", ""],
+)
+def test_iso_date_other_formats(date_str):
+    assert iso_date(date_str) is None
+
+
+def test_future_date_from_string():
+    deadline = datetime.combine(FUTURE, time.max).replace(tzinfo=timezone.utc)
+    for date_str in (FUTURE.isoformat(), FUTURE.strftime("%m/%d/%Y")):
+        assert future_date_from_string(date_str) == deadline
+    with pytest.raises(ValueError, match="BEFORE"):
+        future_date_from_string("2000-01-01")
+    with pytest.raises(ValueError, match="Failed to parse '2030-02-30'"):
+        future_date_from_string("2030-02-30")
+
+
+def test_deadline_memoized_per_request(app, monkeypatch):
+    date_str = FUTURE.strftime("%b %d %Y")
+    calls = []
+    monkeypatch.setattr(dto, "_parse_date", lambda s: calls.append(s) or FUTURE)
+    # Each request has its own application context, and g.
+    with app.app_context(), app.test_request_context():
+        for _ in range(3):
+            future_date_from_string(date_str)
+            future_date_from_string(FUTURE.isoformat())
+        assert calls == [date_str]
+        assert g.deadline_today == date.today()
+        g.deadline_today = FUTURE + timedelta(days=1)
+        with pytest.raises(ValueError, match="BEFORE"):
+            future_date_from_string(date_str)
+    with app.app_context(), app.test_request_context():
+        future_date_from_string(date_str)
+        assert calls == [date_str, date_str]
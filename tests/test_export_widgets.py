@@ -0,0 +1,74 @@
+"""Test cases for GET requests sent to the api.widget_export API endpoint."""
+import csv
+import io
+import json
+from http import HTTPStatus
+
+from flask_api.api.widgets import business
+from tests.util import (
+    ADMIN_EMAIL,
+    WWW_AUTH_NO_TOKEN,
+    add_widgets,
+    count_queries,
+    login_user,
+    export_widgets,
+)
+
+
+def test_export_widgets_ndjson(client, db, admin, monkeypatch):
+    monkeypatch.setattr(business, "EXPORT_BATCH_SIZE", 10)
+    add_widgets(db, admin, 25)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+
+    with count_queries(db.engine) as statements:
+        response = export_widgets(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    assert "filename=widgets.ndjson" in response.headers["Content-Disposition"]
+    rows = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [row["name"] for row in rows] == [f"widget{i:03}" for i in range(25)]
+    assert rows[0]["owner"]["email"] == ADMIN_EMAIL
+    assert rows[0]["link"] == "/api/v1/widgets/widget000"
+    # A single SELECT, read in batches from the cursor.
+    assert sum("FROM widget" in statement for statement in statements) == 1
+
+
+def test_export_widgets_csv(client, db, admin, monkeypatch):
+    monkeypatch.setattr(business, "EXPORT_BATCH_SIZE", 10)
+    add_widgets(db, admin, 25)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+
+    response = export_widgets(
+        client, access_token, format="csv", fields="name,owner", sort="-name"
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "text/csv"
+    reader = csv.DictReader(io.StringIO(response.data.decode()))
+    assert reader.fieldnames == ["name", "owner.email", "owner.public_id"]
+    rows = list(reader)
+    assert [row["name"] for row in rows] == [f"widget{i:03}" for i in range(24, -1, -1)]
+    assert rows[0]["owner.public_id"] == admin.public_id
+
+
+def test_export_widgets_filters(client, db, admin):
+    add_widgets(db, admin, 3)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    response = export_widgets(
+        client, access_token, owner="nobody", fields="name", deadline_passed="false"
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.data == b""
+
+
+def test_export_widgets_invalid_format(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    response = export_widgets(client, access_token, format="xml", page=2)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "format" in response.json["errors"]
+
+
+def test_export_widgets_no_token(client, db):
+    response = client.get("/api/v1/widgets/export")
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.headers["WWW-Authenticate"] == WWW_AUTH_NO_TOKEN
@@ -0,0 +1,79 @@
+"""Unit tests for the bounded password hashing pool."""
+from http import HTTPStatus
+from threading import Event
+
+import pytest
+
+from flask_api import bcrypt, hash_pool
+from flask_api.util.hash_pool import HashPool, HashPoolSaturated
+from tests.util import register_user, login_user
+
+
+@pytest.fixture
+def blocked_pool():
+    """Occupy every worker and queue slot of the hash pool until the test ends."""
+    release = Event()
+    for _ in range(hash_pool.size + hash_pool.queue_limit):
+        hash_pool.submit(release.wait)
+    yield hash_pool
+    release.set()
+
+
+def test_hash_pool_run():
+    pool = HashPool()
+    pool.configure(pool_type="thread", size=2, queue_limit=2, timeout=5)
+    assert pool.run(pow, 2, 10) == 1024
+    stats = pool.stats()
+    assert stats["completed"] == 1 and stats["in_flight"] == 0
+    assert stats["max_wait_ms"] >= 0
+    pool.shutdown()
+
+
+def test_hash_pool_process():
+    pool = HashPool()
+    pool.configure(pool_type="process", size=1, queue_limit=1, timeout=30)
+    hash_bytes = pool.run(bcrypt.generate_password_hash, "password", 4)
+    assert pool.run(bcrypt.check_password_hash, hash_bytes, "password")
+    pool.shutdown()
+
+
+def test_hash_pool_saturated():
+    pool = HashPool()
+    pool.configure(pool_type="thread", size=1, queue_limit=1, timeout=5)
+    release = Event()
+    pool.submit(release.wait)
+    pool.submit(release.wait)
+    assert pool.stats()["queue_depth"] == 1
+
+    with pytest.raises(HashPoolSaturated):
+        pool.run(pow, 2, 10)
+    assert pool.stats()["rejected"] == 1
+    release.set()
+    pool.shutdown()
+
+
+def test_hash_pool_timeout():
+    pool = HashPool()
+    pool.configure(pool_type="thread", size=1, queue_limit=1, timeout=0.1)
+    release = Event()
+    pool.submit(release.wait)
+
+    with pytest.raises(HashPoolSaturated):
+        pool.run(pow, 2, 10)
+    assert pool.stats()["timed_out"] == 1
+    release.set()
+    pool.shutdown()
+
+
+def test_login_hash_pool_busy(client, db, user, blocked_pool):
+    response = login_user(client)
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert "status" in response.json and response.json["status"] == "fail"
+    assert "Retry-After" in response.headers
+    assert "access_token" not in response.json
+
+
+def test_register_hash_pool_busy(client, db, blocked_pool):
+    response = register_user(client)
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert "access_token" not in response.json
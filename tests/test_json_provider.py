@@ -0,0 +1,70 @@
+"""Test cases for the JSON encoding of responses."""
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from http import HTTPStatus
+from uuid import UUID
+
+import pytest
+
+from flask_api import json_provider
+from flask_api.util.json_provider import JSONProvider
+from tests.util import EMAIL, get_user, login_user, register_user, retrieve_widget
+
+DATA = OrderedDict(
+    [
+        ("zebra", "Zoë"),
+        ("apple", [1, 2.5, None, True]),
+        ("created", datetime(2020, 1, 2, 3, 4, 5, 6)),
+        ("deadline", datetime(2020, 1, 2, tzinfo=timezone.utc)),
+        ("day", date(2020, 1, 2)),
+        ("id", UUID(int=1)),
+        ("url", "https://a.b/c"),
+    ]
+)
+EXPECTED = (
+    '{"zebra":"Zoë","apple":[1,2.5,null,true],'
+    '"created":"2020-01-02T03:04:05.000006",'
+    '"deadline":"2020-01-02T00:00:00+00:00","day":"2020-01-02",'
+    '"id":"00000000-0000-0000-0000-000000000001","url":"https://a.b/c"}'
+).encode()
+
+
+@pytest.mark.parametrize("encoder", ["json", "orjson"])
+def test_dumps(encoder):
+    if encoder == "orjson":
+        pytest.importorskip("orjson")
+    provider = JSONProvider()
+    provider.configure(encoder=encoder)
+    assert provider.dumps(DATA) == EXPECTED
+
+    provider.configure(encoder=encoder, sort_keys=True)
+    assert provider.dumps({"b": 1, "a": 2}) == b'{"a":2,"b":1}'
+    with pytest.raises(TypeError):
+        provider.dumps(object())
+
+
+def test_configure_invalid_encoder():
+    provider = JSONProvider()
+    with pytest.raises(ValueError):
+        provider.configure(encoder="simplejson")
+    provider.configure(encoder="auto")
+    assert provider.encoder in ("orjson", "json")
+
+
+def test_flask_and_restx_responses_use_provider(client, db):
+    response = register_user(client)
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.content_type == "application/json"
+    assert response.data == json_provider.dumps(response.json) + b"\n"
+    assert list(response.json)[:3] == ["status", "message", "access_token"]
+
+    access_token = login_user(client).json["access_token"]
+    response = get_user(client, access_token)
+    assert response.content_type == "application/json"
+    assert response.json["email"] == EMAIL
+    assert response.data == json_provider.dumps(response.json) + b"\n"
+
+    response = retrieve_widget(client, access_token, widget_name="missing")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.content_type == "application/json"
+    assert response.data == json_provider.dumps(response.json) + b"\n"
@@ -0,0 +1,84 @@
+"""Test cases for cursor (keyset) pagination of the api.widget_list API endpoint."""
+from datetime import date, timedelta
+from http import HTTPStatus
+
+from tests.util import (
+    ADMIN_EMAIL,
+    WWW_AUTH_NO_TOKEN,
+    login_user,
+    create_widget,
+    retrieve_widget_list,
+)
+
+NAMES = ["widget1", "widget2", "widget3", "widget4", "widget5", "widget6", "widget7"]
+DEADLINE = (date.today() + timedelta(days=3)).strftime("%m/%d/%y")
+
+
+def _create_widgets(client, access_token):
+    for name in NAMES:
+        response = create_widget(
+            client, access_token, widget_name=name, deadline_str=DEADLINE
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+
+def test_retrieve_widget_list_cursor(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    _create_widgets(client, access_token)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = retrieve_widget_list(client, access_token, per_page=5, cursor="")
+    assert response.status_code == HTTPStatus.OK
+    assert "Total-Count" not in response.headers
+    assert "total_items" not in response.json
+    assert response.json["has_prev"] is False
+    assert response.json["has_next"] is True
+    assert [w["name"] for w in response.json["items"]] == NAMES[:5]
+    links = response.json["links"]
+    assert "prev" not in links
+    assert "last" not in links
+    assert f'<{links["next"]}>; rel="next"' in response.headers["Link"]
+
+    response = client.get(links["next"], headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["has_prev"] is True
+    assert response.json["has_next"] is False
+    assert [w["name"] for w in response.json["items"]] == NAMES[5:]
+    links = response.json["links"]
+    assert "next" not in links
+
+    response = client.get(links["prev"], headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["has_prev"] is False
+    assert response.json["has_next"] is True
+    assert [w["name"] for w in response.json["items"]] == NAMES[:5]
+
+
+def test_retrieve_widget_list_cursor_skips_deleted(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    _create_widgets(client, access_token)
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = retrieve_widget_list(client, access_token, per_page=5, cursor="")
+    next_link = response.json["links"]["next"]
+    client.delete(f"/api/v1/widgets/{NAMES[5]}", headers=headers)
+
+    response = client.get(next_link, headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert [w["name"] for w in response.json["items"]] == NAMES[6:]
+
+
+def test_retrieve_widget_list_invalid_cursor(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    response = retrieve_widget_list(client, access_token, cursor="not-a-cursor")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "cursor" in response.json["errors"]
+
+
+def test_retrieve_widget_list_cursor_no_token(client, db):
+    response = client.get("/api/v1/widgets?cursor=")
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.headers["WWW-Authenticate"] == WWW_AUTH_NO_TOKEN
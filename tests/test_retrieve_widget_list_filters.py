@@ -0,0 +1,135 @@
+"""Test cases for filtering and sorting the api.widget_list API endpoint."""
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from sqlalchemy import inspect
+
+from flask_api.models.user import User
+from flask_api.models.widget import Widget
+from tests.util import (
+    ADMIN_EMAIL,
+    PASSWORD,
+    count_queries,
+    login_user,
+    retrieve_widget_list,
+)
+
+NOW = datetime.utcnow().replace(microsecond=0)
+# name, days since creation, days until deadline, owned by admin
+WIDGETS = [
+    ("delta", 10, -2, True),
+    ("alpha", 8, 5, True),
+    ("echo", 6, 5, False),
+    ("charlie", 4, -1, False),
+    ("bravo", 2, 9, True),
+    ("foxtrot", 1, 5, True),
+]
+
+
+def _add_widgets(db, admin):
+    other = User(email="other@email.com", password=PASSWORD)
+    db.session.add(other)
+    for name, age, remaining, admin_owned in WIDGETS:
+        widget = Widget(
+            name=name,
+            created_at=NOW - timedelta(days=age),
+            deadline=NOW + timedelta(days=remaining),
+            owner=admin if admin_owned else other,
+        )
+        db.session.add(widget)
+    db.session.commit()
+    return other
+
+
+def _names(response):
+    assert response.status_code == HTTPStatus.OK, response.json
+    return [item["name"] for item in response.json["items"]]
+
+
+def test_retrieve_widget_list_filters(client, db, admin):
+    other = _add_widgets(db, admin)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+
+    url = f"/api/v1/widgets?owner={other.public_id}"
+    response = client.get(url, headers={"Authorization": f"Bearer {access_token}"})
+    assert _names(response) == ["echo", "charlie"]
+    assert response.json["total_items"] == 2
+
+    url = "/api/v1/widgets?deadline_passed=true"
+    with count_queries(db.engine) as statements:
+        response = client.get(url, headers={"Authorization": f"Bearer {access_token}"})
+    assert _names(response) == ["delta", "charlie"]
+    assert any("widget.deadline <" in statement for statement in statements)
+
+    url = "/api/v1/widgets?deadline_passed=false&owner=" + admin.public_id
+    response = client.get(url, headers={"Authorization": f"Bearer {access_token}"})
+    assert _names(response) == ["alpha", "bravo", "foxtrot"]
+
+    created_after = (NOW - timedelta(days=7)).date().isoformat()
+    created_before = (NOW - timedelta(days=1)).isoformat()
+    url = f"/api/v1/widgets?created_after={created_after}"
+    url += f"&created_before={created_before}"
+    response = client.get(url, headers={"Authorization": f"Bearer {access_token}"})
+    assert _names(response) == ["echo", "charlie", "bravo"]
+
+    deadline_after = (NOW + timedelta(days=5)).isoformat() + "+00:00"
+    url = f"/api/v1/widgets?deadline_after={deadline_after}&deadline_before=2999-01-01"
+    response = client.get(url, headers={"Authorization": f"Bearer {access_token}"})
+    assert _names(response) == ["alpha", "echo", "bravo", "foxtrot"]
+
+
+def test_retrieve_widget_list_sort(client, db, admin):
+    _add_widgets(db, admin)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get("/api/v1/widgets?sort=name", headers=headers)
+    assert _names(response) == sorted(name for name, *_ in WIDGETS)
+
+    response = client.get("/api/v1/widgets?sort=-created_at", headers=headers)
+    assert _names(response) == [name for name, *_ in reversed(WIDGETS)]
+
+    url = "/api/v1/widgets?sort=-deadline&per_page=5&deadline_passed=false"
+    response = client.get(url, headers=headers)
+    assert _names(response) == ["bravo", "foxtrot", "echo", "alpha"]
+    assert "sort=-deadline" in response.json["links"]["self"]
+    assert "deadline_passed=false" in response.json["links"]["first"]
+
+
+def test_retrieve_widget_list_sort_cursor(client, db, admin):
+    _add_widgets(db, admin)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    # Three widgets share a deadline, ties are ordered by id in the same direction.
+    url = "/api/v1/widgets?sort=-deadline&per_page=5&cursor="
+    response = client.get(url, headers=headers)
+    assert _names(response) == ["bravo", "foxtrot", "echo", "alpha", "charlie"]
+    next_link = response.json["links"]["next"]
+    assert "sort=-deadline" in next_link
+
+    response = client.get(next_link, headers=headers)
+    assert _names(response) == ["delta"]
+    response = client.get(response.json["links"]["prev"], headers=headers)
+    assert _names(response) == ["bravo", "foxtrot", "echo", "alpha", "charlie"]
+
+    response = retrieve_widget_list(client, access_token, per_page=5, cursor="")
+    response = client.get(response.json["links"]["next"] + "&sort=name", headers=headers)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_retrieve_widget_list_invalid_filters(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    url = "/api/v1/widgets?sort=info_url&created_after=someday&deadline_passed=maybe"
+    response = client.get(url, headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert set(response.json["errors"]) == {"sort", "created_after", "deadline_passed"}
+
+
+def test_widget_indexes(db):
+    indexed = {
+        column
+        for index in inspect(db.engine).get_indexes("widget")
+        for column in index["column_names"]
+    }
+    assert {"owner_id", "created_at", "deadline"} <= indexed
@@ -0,0 +1,82 @@
+"""Test cases for the total parameter of the api.widget_list API endpoint."""
+from datetime import date, timedelta
+from http import HTTPStatus
+
+from flask_api.models.widget import Widget
+from tests.util import (
+    ADMIN_EMAIL,
+    login_user,
+    create_widget,
+    delete_widget,
+    retrieve_widget_list,
+)
+
+DEADLINE = (date.today() + timedelta(days=3)).strftime("%m/%d/%y")
+
+
+def _create_widgets(client, access_token, count):
+    for i in range(count):
+        response = create_widget(
+            client, access_token, widget_name=f"widget{i}", deadline_str=DEADLINE
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+
+def test_retrieve_widget_list_total_cached(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    _create_widgets(client, access_token, 6)
+
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.json["total_items"] == 6
+    assert response.headers["Total-Count"] == "6"
+
+    # Rows added behind the API's back are only seen once the cache expires.
+    db.session.add(
+        Widget(name="widget6", deadline=date.today() + timedelta(days=1), owner=admin)
+    )
+    db.session.commit()
+    response = retrieve_widget_list(client, access_token, per_page=5, total="cached")
+    assert response.json["total_items"] == 6
+    response = retrieve_widget_list(client, access_token, per_page=5, total="exact")
+    assert response.json["total_items"] == 7
+    assert response.json["total_pages"] == 2
+
+    # Creating and deleting widgets through the API invalidates the cache.
+    response = create_widget(
+        client, access_token, widget_name="widget7", deadline_str=DEADLINE
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.json["total_items"] == 8
+    response = delete_widget(client, access_token, widget_name="widget7")
+    assert response.status_code == HTTPStatus.NO_CONTENT
+    response = retrieve_widget_list(client, access_token, per_page=5)
+    assert response.json["total_items"] == 7
+
+
+def test_retrieve_widget_list_total_none(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    _create_widgets(client, access_token, 6)
+
+    response = retrieve_widget_list(client, access_token, per_page=5, total="none")
+    assert response.status_code == HTTPStatus.OK
+    assert "Total-Count" not in response.headers
+    assert "total_items" not in response.json
+    assert "total_pages" not in response.json
+    assert "last" not in response.json["links"]
+    assert response.json["has_next"] is True
+    assert len(response.json["items"]) == 5
+
+    response = retrieve_widget_list(
+        client, access_token, page=2, per_page=5, total="none"
+    )
+    assert response.json["has_prev"] is True
+    assert response.json["has_next"] is False
+    assert len(response.json["items"]) == 1
+
+
+def test_retrieve_widget_list_invalid_total(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    response = retrieve_widget_list(client, access_token, total="approximate")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "total" in response.json["errors"]
@@ -0,0 +1,98 @@
+"""Golden output tests: compiled serializers must match flask_restx.marshal."""
+import json
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from flask_restx import Model, marshal
+from flask_restx.fields import Integer, Nested, String, Url
+
+from flask_api.api.auth.dto import user_model, user_serializer
+from flask_api.api.widgets.business import _Pagination, cursor_page
+from flask_api.api.widgets.dto import (
+    cursor_pagination_model,
+    cursor_pagination_serializer,
+    pagination_model,
+    pagination_model_for,
+    pagination_serializer,
+    pagination_serializer_for,
+    widget_model,
+    widget_serializer,
+)
+from flask_api.models.user import User
+from flask_api.models.widget import Widget
+from flask_api.util.serializer import compile_model
+from tests.util import EMAIL, PASSWORD
+
+
+def _same(serialized, marshalled):
+    # Same keys in the same order, same values and JSON types.
+    assert json.dumps(serialized) == json.dumps(marshalled)
+
+
+def _widgets(db, user):
+    deadline = datetime.utcnow() + timedelta(days=3)
+    widgets = [
+        Widget(name="full", info_url="https://www.one.com", deadline=deadline),
+        Widget(name="no_url", deadline=datetime.utcnow() - timedelta(days=3)),
+    ]
+    for widget in widgets:
+        widget.owner = user
+        db.session.add(widget)
+    db.session.commit()
+    return widgets
+
+
+def test_widget_serializer(db):
+    user = User(email=EMAIL, password=PASSWORD)
+    for widget in _widgets(db, user):
+        _same(widget_serializer(widget), marshal(widget, widget_model))
+
+
+def test_pagination_serializer(db):
+    user = User(email=EMAIL, password=PASSWORD)
+    widgets = _widgets(db, user)
+    for pagination in (
+        _Pagination(1, 10, 2, widgets, False),
+        _Pagination(2, 1, None, widgets[1:], True),
+        _Pagination(1, 10, 0, [], False),
+    ):
+        _same(pagination_serializer(pagination), marshal(pagination, pagination_model))
+
+    page = cursor_page(widgets, 5, {}, None, False, True)._asdict()
+    page["links"] = {"self": "/api/v1/widgets?cursor=", "next": None}
+    _same(cursor_pagination_serializer(page), marshal(page, cursor_pagination_model))
+
+    fields = ("name", "deadline_passed", "owner")
+    pagination = _Pagination(1, 10, 2, widgets, False)
+    _same(
+        pagination_serializer_for(fields)(pagination),
+        marshal(pagination, pagination_model_for(fields)),
+    )
+
+
+def test_user_serializer(db):
+    user = User(email=EMAIL, password=PASSWORD)
+    db.session.add(user)
+    db.session.commit()
+    user.token_expires_in = "5 seconds"
+    _same(user_serializer(user), marshal(user, user_model))
+    del user.token_expires_in
+    _same(user_serializer(user), marshal(user, user_model))
+
+
+def test_compile_model_other_fields(app):
+    model = Model(
+        "Other",
+        {
+            "count": Integer(default=3),
+            "label": String(attribute=lambda obj: obj["name"].upper()),
+            "nested": {"name": String, "size": Integer},
+            "skipped": Nested(Model("Inner", {"a": String}), skip_none=True),
+            "null": Nested(Model("Inner", {"a": String}), allow_null=True),
+            "link": Url("api.widget"),
+            "date": String(attribute="day"),
+        },
+    )
+    data = OrderedDict(name="widget", day=date(2020, 1, 2), size="7")
+    with app.test_request_context():
+        _same(compile_model(model)(data), marshal(data, model))
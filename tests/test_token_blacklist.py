@@ -0,0 +1,50 @@
+"""Unit tests for BlacklistedToken model class."""
+import time
+
+from flask_api.models.token_blacklist import BlacklistedToken
+from flask_api.util.periodic import run_periodically
+
+
+def add_blacklisted_tokens(db, count, expires_at, prefix):
+    for i in range(count):
+        db.session.add(BlacklistedToken(f"{prefix}-{i}", expires_at))
+    db.session.commit()
+
+
+def test_purge_expired(db):
+    add_blacklisted_tokens(db, 5, time.time() - 60, prefix="expired")
+    add_blacklisted_tokens(db, 2, time.time() + 60, prefix="valid")
+
+    result = BlacklistedToken.purge_expired(batch_size=2)
+    assert result.deleted == 5
+    assert result.elapsed >= 0
+
+    remaining = [row.token_digest for row in BlacklistedToken.query.all()]
+    assert sorted(remaining) == sorted(
+        BlacklistedToken.digest(token) for token in ["valid-0", "valid-1"]
+    )
+    assert BlacklistedToken.purge_expired().deleted == 0
+
+
+def test_purge_expired_periodically(app, db):
+    add_blacklisted_tokens(db, 3, time.time() - 60, prefix="expired")
+
+    stop = run_periodically(app, 0.05, BlacklistedToken.purge_expired, 1000)
+    for _ in range(40):
+        if not BlacklistedToken.query.count():
+            break
+        db.session.remove()
+        time.sleep(0.05)
+    stop.set()
+    assert BlacklistedToken.query.count() == 0
+
+
+def test_blacklisted_token_stores_digest(db):
+    access_token = "header.payload.signature"
+    add_blacklisted_tokens(db, 1, time.time() + 60, prefix=access_token)
+
+    blacklisted = BlacklistedToken.query.one()
+    assert len(blacklisted.token_digest) == 64
+    assert access_token not in blacklisted.token_digest
+    assert BlacklistedToken.check_blacklist(f"{access_token}-0")
+    assert not BlacklistedToken.check_blacklist(access_token)
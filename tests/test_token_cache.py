@@ -0,0 +1,94 @@
+"""Unit tests for the verified access token cache."""
+import time
+from http import HTTPStatus
+
+from flask_api import token_cache
+from flask_api.models.user import User
+from flask_api.util.cache import TTLCache
+from tests.util import (
+    ADMIN_EMAIL,
+    FORBIDDEN,
+    login_user,
+    logout_user,
+    retrieve_metrics,
+)
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("expired", 1, expires_at=time.time() - 1)
+    cache.set("valid", 2)
+    assert cache.get("expired") is None
+    assert cache.get("valid") == 2
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_evicts_beyond_maxbytes():
+    cache = TTLCache(maxsize=10, ttl=60, maxbytes=100)
+    cache.set("a", 1, size=60)
+    cache.set("b", 2, size=30)
+    cache.set("too-big", 3, size=101)
+    assert cache.get("too-big") is None
+    cache.set("a", 4, size=50)
+    assert cache.bytes == 80
+    cache.set("c", 5, size=40)
+    assert cache.get("b") is None
+    assert cache.get("a") == 4 and cache.get("c") == 5
+    assert cache.bytes == 90 and cache.evictions == 1
+    cache.invalidate()
+    assert cache.bytes == 0 and cache.hits == 2
+
+
+def test_decode_access_token_cached(user):
+    access_token = user.encode_access_token().decode()
+    assert User.decode_access_token(access_token).success
+    assert token_cache.misses == 1 and token_cache.hits == 0
+
+    result = User.decode_access_token(f"Bearer {access_token}")
+    assert result.success
+    assert result.value["public_id"] == user.public_id
+    assert token_cache.hits == 1
+
+
+def test_logout_evicts_cached_token(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    assert User.decode_access_token(access_token).success
+    assert access_token in token_cache._data
+
+    response = logout_user(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    assert access_token not in token_cache._data
+    result = User.decode_access_token(access_token)
+    assert not result.success
+    assert result.error == "Token blacklisted. Please log in again."
+
+
+def test_retrieve_metrics(client, db, admin):
+    response = login_user(client, email=ADMIN_EMAIL)
+    access_token = response.json["access_token"]
+    retrieve_metrics(client, access_token)
+    response = retrieve_metrics(client, access_token)
+    assert response.status_code == HTTPStatus.OK
+    stats = response.json["token_cache"]
+    assert stats["size"] == 1
+    assert stats["misses"] == 1 and stats["hits"] == 1
+
+
+def test_retrieve_metrics_no_admin_token(client, db, user):
+    response = login_user(client)
+    access_token = response.json["access_token"]
+    response = retrieve_metrics(client, access_token)
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert "message" in response.json and response.json["message"] == FORBIDDEN
@@ -2,9 +2,12 @@
 from datetime import date, timedelta
 from http import HTTPStatus
 
+from flask_api.api.widgets import business
+from flask_api.models.widget import Widget
 from tests.util import (
     ADMIN_EMAIL,
     DEFAULT_NAME,
+    count_queries,
     login_user,
     create_widget,
     retrieve_widget,
@@ -39,3 +42,54 @@ def test_update_widget(client, db, admin):
     assert "deadline" in response.json and UPDATED_DEADLINE in response.json["deadline"]
     assert "owner" in response.json and "email" in response.json["owner"]
     assert response.json["owner"]["email"] == ADMIN_EMAIL
+
+
+def test_update_widget_single_write(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    for status_code, version in ((HTTPStatus.CREATED, 1), (HTTPStatus.OK, 2)):
+        with count_queries(db.engine) as statements:
+            response = update_widget(
+                client,
+                access_token,
+                widget_name=DEFAULT_NAME,
+                info_url=UPDATED_URL,
+                deadline_str=UPDATED_DEADLINE,
+            )
+        assert response.status_code == status_code
+        writes = [s for s in statements if not s.startswith("SELECT")]
+        assert len(writes) == 1
+        assert "ON CONFLICT (name) DO UPDATE" in writes[0]
+        db.session.remove()
+        widget = Widget.find_by_name(DEFAULT_NAME)
+        assert widget.version == version
+        assert widget.owner.email == ADMIN_EMAIL
+    assert response.json["message"] == f"'{DEFAULT_NAME}' was successfully updated"
+
+
+def test_update_widget_without_upsert(client, db, admin, monkeypatch):
+    monkeypatch.setattr(business, "UPSERT_DIALECTS", {})
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    for status_code in (HTTPStatus.CREATED, HTTPStatus.OK):
+        response = update_widget(
+            client,
+            access_token,
+            widget_name=DEFAULT_NAME,
+            info_url=UPDATED_URL,
+            deadline_str=UPDATED_DEADLINE,
+        )
+        assert response.status_code == status_code
+    db.session.remove()
+    assert Widget.find_by_name(DEFAULT_NAME).version == 2
+
+
+def test_update_widget_reserved_name(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    response = update_widget(
+        client,
+        access_token,
+        widget_name="export",
+        info_url=UPDATED_URL,
+        deadline_str=UPDATED_DEADLINE,
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert Widget.find_by_name("export") is None
@@ -49,3 +49,8 @@ def test_decode_access_token_invalid(user):
     result = User.decode_access_token(access_token_mod)
     assert not result.success
     assert result.error == "Invalid token. Please log in again."
+
+
+def test_password_log_rounds(user):
+    assert user.password_log_rounds == 4
+    assert not user.needs_rehash()
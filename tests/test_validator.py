@@ -0,0 +1,113 @@
+"""Test cases for request validators compiled from RequestParsers."""
+from datetime import date, timedelta
+from http import HTTPStatus
+
+import pytest
+from flask import url_for
+from flask_restx.inputs import boolean
+from flask_restx.reqparse import RequestParser
+from werkzeug.exceptions import BadRequest
+
+from flask_api.api.auth.dto import auth_reqparser, auth_validator
+from flask_api.api.widgets.dto import (
+    create_widget_reqparser,
+    create_widget_validator,
+    update_widget_reqparser,
+    update_widget_validator,
+)
+from flask_api.util.validator import compile_parser
+from tests.util import ADMIN_EMAIL, BAD_REQUEST, EMAIL, PASSWORD, login_user
+
+DEADLINE = (date.today() + timedelta(days=3)).isoformat()
+PARSERS = [
+    (auth_reqparser, auth_validator),
+    (create_widget_reqparser, create_widget_validator),
+    (update_widget_reqparser, update_widget_validator),
+]
+FORMS = [
+    dict(email=EMAIL, password=PASSWORD),
+    dict(email="not an email", password=""),
+    dict(name="widget", info_url="https://www.fakesite.com", deadline=DEADLINE),
+    dict(name="bad name", info_url="ftp://fakesite.com", deadline="1/1/2000"),
+    dict(info_url="https://www.fakesite.com", deadline="not a date"),
+    dict(),
+]
+
+
+def _parse(parse, app, **request_args):
+    with app.test_request_context(method="POST", **request_args):
+        try:
+            return parse(), None
+        except BadRequest as e:
+            return None, e.data
+
+
+@pytest.mark.parametrize("form", FORMS)
+@pytest.mark.parametrize("parser, validator", PARSERS)
+def test_same_result_as_parse_args(app, parser, validator, form):
+    expected = _parse(parser.parse_args, app, data=form)
+    assert _parse(validator, app, data=form) == expected
+
+    values, errors = _parse(validator, app, json=form)
+    if expected[1]:
+        assert errors["message"] == BAD_REQUEST
+        assert set(errors["errors"]) == set(expected[1]["errors"])
+        for message in errors["errors"].values():
+            assert "the post body" not in message
+    else:
+        assert values == expected[0]
+
+
+def test_compiled_options(app):
+    parser = RequestParser(bundle_errors=True)
+    parser.add_argument("flag", type=boolean, location="form", default=False)
+    parser.add_argument("size", type=int, location="form", choices=[1, 2], help="Size:")
+    parser.add_argument("kind", location="form", case_sensitive=False, choices=["A"])
+    parser.add_argument("note", location="form", trim=True, nullable=True, dest="text")
+    validator = compile_parser(parser)
+    for body in (
+        dict(size="2", kind="a", note="  hi "),
+        dict(size="3", kind="b", flag="maybe"),
+    ):
+        assert _parse(validator, app, data=body) == _parse(
+            parser.parse_args, app, data=body
+        )
+    values, _ = _parse(validator, app, json=dict(size=1, kind="A", flag=True, note=None))
+    assert values == dict(flag=True, size=1, kind="a", text=None)
+
+    parser.add_argument("page", type=int, location="args")
+    with pytest.raises(ValueError):
+        compile_parser(parser)
+
+
+def test_json_bodies(client, db, admin):
+    response = client.post(
+        url_for("api.auth_register"), json=dict(email=EMAIL, password=PASSWORD)
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    response = client.post(
+        url_for("api.auth_login"), json=dict(email=EMAIL, password=PASSWORD)
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    widget = dict(name="json", info_url="https://www.fakesite.com", deadline=DEADLINE)
+    response = client.post(url_for("api.widget_list"), headers=headers, json=widget)
+    assert response.status_code == HTTPStatus.CREATED
+    widget.pop("name")
+    response = client.put(
+        url_for("api.widget", name="json"), headers=headers, json=widget
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.post(
+        url_for("api.widget_list"), headers=headers, json=dict(name=None, deadline=3)
+    )
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json["message"] == BAD_REQUEST
+    assert response.json["errors"] == {
+        "name": "Must not be null!",
+        "info_url": "Missing required parameter in the JSON body",
+        "deadline": response.json["errors"]["deadline"],
+    }
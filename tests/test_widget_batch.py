@@ -0,0 +1,127 @@
+"""Test cases for POST requests sent to the api.widget_batch_* API endpoints."""
+from datetime import date, timedelta
+from http import HTTPStatus
+
+from flask_api import widget_response_cache
+from flask_api.api.widgets import business
+from flask_api.models.widget import Widget
+from tests.util import (
+    ADMIN_EMAIL,
+    BAD_REQUEST,
+    EMAIL,
+    FORBIDDEN,
+    batch_widgets,
+    count_queries,
+    login_user,
+    retrieve_widget,
+)
+
+DEADLINE = (date.today() + timedelta(days=3)).isoformat()
+URL = "https://www.fakesite.com"
+
+
+def _items(names, info_url=URL):
+    return [dict(name=name, info_url=info_url, deadline=DEADLINE) for name in names]
+
+
+def test_batch_create(client, db, admin, monkeypatch):
+    monkeypatch.setattr(business, "BATCH_LOOKUP_SIZE", 10)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    names = [f"widget{i:02}" for i in range(25)]
+
+    with count_queries(db.engine) as statements:
+        response = batch_widgets(client, access_token, "create", widgets=_items(names))
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["status"] == "success"
+    assert response.json["message"] == "25 succeeded, 0 failed."
+    results = response.json["results"]
+    assert [result["name"] for result in results] == names
+    assert all(result["status_code"] == HTTPStatus.CREATED for result in results)
+    assert Widget.query.count() == 25
+    widget = Widget.find_by_name("widget07")
+    assert widget.owner.email == ADMIN_EMAIL
+    assert widget.version == 1
+    assert widget.created_at and widget.updated_at
+    # Name lookups are IN queries of BATCH_LOOKUP_SIZE names, one INSERT for all.
+    lookups = [s for s in statements if s.startswith("SELECT widget.name")]
+    inserts = [s for s in statements if s.startswith("INSERT INTO widget")]
+    assert len(lookups) == 3
+    assert len(inserts) == 1
+
+
+def test_batch_create_reports_each_item(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    batch_widgets(client, access_token, "create", widgets=_items(["taken"]))
+    widgets = _items(["new", "taken", "new", "bad name"])
+    widgets.append(dict(name="no_deadline", info_url="not a url"))
+    widgets.append("not an object")
+
+    response = batch_widgets(client, access_token, "create", widgets=widgets)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["status"] == "fail"
+    assert response.json["message"] == "1 succeeded, 5 failed."
+    results = response.json["results"]
+    status_codes = [result["status_code"] for result in results]
+    assert status_codes == [201, 409, 409, 400, 400, 400]
+    assert [result["index"] for result in results] == list(range(6))
+    assert "already exists" in results[1]["message"]
+    assert results[3]["message"] == BAD_REQUEST
+    assert "invalid characters" in results[3]["errors"]["name"]
+    assert set(results[4]["errors"]) == {"info_url", "deadline"}
+    assert results[5]["name"] is None
+    assert Widget.query.count() == 2
+
+
+def test_batch_update(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    batch_widgets(client, access_token, "create", widgets=_items(["one", "two"]))
+    etag = retrieve_widget(client, access_token, "one").headers["ETag"]
+    new_url = "https://www.othersite.com"
+    widgets = _items(["ONE", "two", "three", "two"], info_url=new_url)
+
+    response = batch_widgets(client, access_token, "update", widgets=widgets)
+    assert response.status_code == HTTPStatus.OK
+    results = response.json["results"]
+    assert [result["status_code"] for result in results] == [200, 200, 201, 409]
+    assert [result["name"] for result in results] == ["one", "two", "three", "two"]
+    db.session.remove()
+    for name in ("one", "two", "three"):
+        widget = Widget.find_by_name(name)
+        assert widget.info_url == new_url
+        assert widget.version == (1 if name == "three" else 2)
+    assert not len(widget_response_cache)
+    assert retrieve_widget(client, access_token, "one").headers["ETag"] != etag
+
+
+def test_batch_delete(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    batch_widgets(client, access_token, "create", widgets=_items(["one", "two"]))
+
+    names = ["One", "missing", "one", 3, "two"]
+    response = batch_widgets(client, access_token, "delete", names=names)
+    assert response.status_code == HTTPStatus.OK
+    results = response.json["results"]
+    assert [result["status_code"] for result in results] == [204, 404, 404, 400, 204]
+    assert response.json["message"] == "2 succeeded, 3 failed."
+    assert Widget.query.count() == 0
+
+
+def test_batch_invalid_payload(client, db, admin, app):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    app.config["WIDGET_BATCH_MAX_SIZE"] = 2
+    for payload in ({}, {"widgets": []}, {"widgets": {}}, {"widgets": [{}, {}, {}]}):
+        response = batch_widgets(client, access_token, "create", **payload)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json["message"] == BAD_REQUEST
+        assert "widgets" in response.json["errors"]
+    response = batch_widgets(client, access_token, "delete", widgets=["one"])
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "names" in response.json["errors"]
+
+
+def test_batch_no_admin_token(client, db, user):
+    access_token = login_user(client, email=EMAIL).json["access_token"]
+    response = batch_widgets(client, access_token, "create", widgets=_items(["one"]))
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json["message"] == FORBIDDEN
+    assert Widget.query.count() == 0
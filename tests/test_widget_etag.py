@@ -0,0 +1,111 @@
+"""Test cases for ETag and conditional GET requests on the widget endpoints."""
+from datetime import date, timedelta
+from http import HTTPStatus
+
+from flask_api.api.widgets import business
+from tests.util import (
+    ADMIN_EMAIL,
+    DEFAULT_URL,
+    login_user,
+    create_widget,
+    update_widget,
+    delete_widget,
+)
+
+DEADLINE = (date.today() + timedelta(days=3)).strftime("%m/%d/%y")
+# time_remaining is left out, it changes (and so does the ETag) every second.
+FIELDS = "name,info_url,deadline,deadline_passed,owner,link"
+
+
+def _get(client, access_token, url, etag=None, since=None):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if since:
+        headers["If-Modified-Since"] = since
+    return client.get(url, headers=headers)
+
+
+def test_retrieve_widget_etag(client, db, admin, monkeypatch):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_widget(client, access_token, widget_name="widget0", deadline_str=DEADLINE)
+    url = f"/api/v1/widgets/widget0?fields={FIELDS}"
+
+    response = _get(client, access_token, url)
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers["ETag"]
+    assert not etag.startswith("W/")
+    # deadline_passed changes without an update, Last-Modified can't be used.
+    assert "Last-Modified" not in response.headers
+
+    marshalled = []
+    monkeypatch.setattr(
+        business, "widget_serializer_for", lambda fields: marshalled.append
+    )
+    response = _get(client, access_token, url, etag=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    assert not marshalled
+    monkeypatch.undo()
+
+    stored_url = "/api/v1/widgets/widget0?fields=name,deadline"
+    response = _get(client, access_token, stored_url)
+    last_modified = response.headers["Last-Modified"]
+    response = _get(client, access_token, stored_url, since=last_modified)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    # Another selection of fields is another representation.
+    response = _get(client, access_token, stored_url, etag)
+    assert response.status_code == HTTPStatus.OK
+
+    response = update_widget(client, access_token, "widget0", DEFAULT_URL, DEADLINE)
+    assert response.status_code == HTTPStatus.OK
+    response = _get(client, access_token, url, etag=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+
+
+def test_retrieve_widget_clock_fields_ignore_if_modified_since(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_widget(client, access_token, widget_name="widget0", deadline_str=DEADLINE)
+    since = "Fri, 01 Jan 2100 00:00:00 GMT"
+
+    for fields in ("deadline_passed", "name,time_remaining"):
+        url = f"/api/v1/widgets/widget0?fields={fields}"
+        response = _get(client, access_token, url, since=since)
+        assert response.status_code == HTTPStatus.OK
+        assert "Last-Modified" not in response.headers
+    response = _get(
+        client, access_token, "/api/v1/widgets/widget0?fields=name", since=since
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_retrieve_widget_list_etag(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    for name in ("widget0", "widget1"):
+        create_widget(client, access_token, widget_name=name, deadline_str=DEADLINE)
+
+    for url in (
+        f"/api/v1/widgets?fields={FIELDS}",
+        f"/api/v1/widgets?fields={FIELDS}&cursor=",
+    ):
+        response = _get(client, access_token, url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.headers["ETag"]
+        assert "Last-Modified" not in response.headers
+        response = _get(client, access_token, url, etag=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    url = f"/api/v1/widgets?fields={FIELDS}"
+    etags = {_get(client, access_token, url).headers["ETag"]}
+    create_widget(client, access_token, widget_name="widget2", deadline_str=DEADLINE)
+    etags.add(_get(client, access_token, url).headers["ETag"])
+    update_widget(client, access_token, "widget1", "https://www.other.com", DEADLINE)
+    etags.add(_get(client, access_token, url).headers["ETag"])
+    delete_widget(client, access_token, "widget2")
+    response = _get(client, access_token, url, etag=",".join(etags))
+    assert response.status_code == HTTPStatus.OK
+    etags.add(response.headers["ETag"])
+    assert len(etags) == 4
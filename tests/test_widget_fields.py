@@ -0,0 +1,81 @@
+"""Test cases for the fields parameter of the widget GET endpoints."""
+from datetime import date, timedelta
+from http import HTTPStatus
+
+from flask_api.models import widget as widget_module
+from tests.util import (
+    ADMIN_EMAIL,
+    BAD_REQUEST,
+    count_queries,
+    login_user,
+    create_widget,
+    retrieve_widget,
+    retrieve_widget_list,
+)
+
+DEADLINE = (date.today() + timedelta(days=3)).strftime("%m/%d/%y")
+
+
+def _not_evaluated(*args):
+    raise AssertionError("unrequested field was computed")
+
+
+def test_retrieve_widget_list_fields(client, db, admin, monkeypatch):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    for i in range(3):
+        create_widget(
+            client, access_token, widget_name=f"widget{i}", deadline_str=DEADLINE
+        )
+    retrieve_widget_list(client, access_token)
+    # Used by the time_remaining and deadline fields only.
+    monkeypatch.setattr(widget_module, "format_timedelta_str", _not_evaluated)
+    monkeypatch.setattr(widget_module, "localized_dt_string", _not_evaluated)
+
+    with count_queries(db.engine) as statements:
+        response = retrieve_widget_list(
+            client, access_token, fields="deadline_passed,name"
+        )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json["total_items"] == 3
+    assert "next" not in response.json["links"]
+    assert response.json["items"] == [
+        {"name": f"widget{i}", "deadline_passed": False} for i in range(3)
+    ]
+    assert not any("site_user" in statement for statement in statements)
+
+    response = retrieve_widget_list(client, access_token, cursor="", fields="name,owner")
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.json["items"][0]) == ["name", "owner"]
+    assert response.json["items"][0]["owner"]["email"] == ADMIN_EMAIL
+
+
+def test_retrieve_widget_fields(client, db, admin, monkeypatch):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_widget(client, access_token, widget_name="widget0", deadline_str=DEADLINE)
+    monkeypatch.setattr(widget_module, "format_timedelta_str", _not_evaluated)
+
+    response = retrieve_widget(client, access_token, "widget0", fields="name, link")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == {"name": "widget0", "link": "/api/v1/widgets/widget0"}
+
+
+def test_retrieve_widget_all_fields(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_widget(client, access_token, widget_name="widget0", deadline_str=DEADLINE)
+    response = retrieve_widget(client, access_token, "widget0")
+    assert response.status_code == HTTPStatus.OK
+    assert "time_remaining" in response.json
+    assert response.json["owner"]["email"] == ADMIN_EMAIL
+
+
+def test_retrieve_widget_invalid_fields(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_widget(client, access_token, widget_name="widget0", deadline_str=DEADLINE)
+    response = retrieve_widget(client, access_token, "widget0", fields="name,secret")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json["message"] == BAD_REQUEST
+    assert "fields" in response.json["errors"]
+
+    response = retrieve_widget_list(client, access_token, fields=",")
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "fields" in response.json["errors"]
@@ -0,0 +1,90 @@
+"""Test the number of SQL statements issued by the widget read endpoints."""
+from datetime import date, timedelta
+from http import HTTPStatus
+
+import pytest
+
+from flask_api import widget_response_cache
+from flask_api.models.user import User
+from flask_api.models.widget import Widget
+from tests.util import (
+    ADMIN_EMAIL,
+    PASSWORD,
+    count_queries,
+    login_user,
+    retrieve_widget,
+    retrieve_widget_list,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_response_cache(app):
+    """Responses served from the cache would not run any query."""
+    widget_response_cache.configure(maxsize=0, ttl=0)
+
+
+def _add_widgets(db, admin, count):
+    """Add widgets owned by count different users."""
+    deadline = date.today() + timedelta(days=3)
+    for i in range(count):
+        owner = User(email=f"owner{i}@email.com", password=PASSWORD, admin=True)
+        db.session.add(owner)
+        db.session.add(Widget(name=f"widget{i}", deadline=deadline, owner=owner))
+    db.session.commit()
+
+
+def _request(db, func, *args, **kwargs):
+    # Start from an empty session, as a new request would in production.
+    db.session.remove()
+    with count_queries(db.engine) as statements:
+        response = func(*args, **kwargs)
+    assert response.status_code == HTTPStatus.OK
+    return response, statements
+
+
+def test_retrieve_widget_list_queries(client, db, admin):
+    _add_widgets(db, admin, 10)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    # Warm up token caches and the blacklist filter so only widget queries remain.
+    retrieve_widget_list(client, access_token)
+
+    response, statements = _request(
+        db, retrieve_widget_list, client, access_token, per_page=10
+    )
+    assert len(response.json["items"]) == 10
+    assert {item["owner"]["email"] for item in response.json["items"]} == {
+        f"owner{i}@email.com" for i in range(10)
+    }
+    # SELECT widgets joined with owners, the count is cached by the warm-up request
+    assert len(statements) == 1
+    assert "JOIN site_user" in statements[0]
+
+    response, statements = _request(
+        db, retrieve_widget_list, client, access_token, per_page=10, total="exact"
+    )
+    assert len(statements) == 2
+    assert "count(*)" in statements[1]
+
+
+def test_retrieve_widget_list_cursor_queries(client, db, admin):
+    _add_widgets(db, admin, 10)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    retrieve_widget_list(client, access_token)
+
+    response, statements = _request(
+        db, retrieve_widget_list, client, access_token, per_page=5, cursor=""
+    )
+    assert len(response.json["items"]) == 5
+    assert len(statements) == 1
+
+
+def test_retrieve_widget_queries(client, db, admin):
+    _add_widgets(db, admin, 2)
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    retrieve_widget_list(client, access_token)
+
+    response, statements = _request(
+        db, retrieve_widget, client, access_token, widget_name="widget1"
+    )
+    assert response.json["owner"]["email"] == "owner1@email.com"
+    assert len(statements) == 1
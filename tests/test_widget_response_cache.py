@@ -0,0 +1,110 @@
+"""Test cases for the cache of widget GET responses."""
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from flask_api import widget_response_cache
+from flask_api.models.widget import Widget
+from tests.util import (
+    ADMIN_EMAIL,
+    DEFAULT_URL,
+    count_queries,
+    login_user,
+    create_widget,
+    delete_widget,
+    retrieve_metrics,
+    retrieve_widget,
+    retrieve_widget_list,
+    update_widget,
+)
+
+DEADLINE = (datetime.now() + timedelta(days=3)).strftime("%m/%d/%y")
+
+
+def test_widget_list_response_cached(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_widget(client, access_token, widget_name="widget0", deadline_str=DEADLINE)
+
+    response = retrieve_widget_list(client, access_token, per_page=10, total="cached")
+    assert response.status_code == HTTPStatus.OK
+    with count_queries(db.engine) as statements:
+        cached = retrieve_widget_list(client, access_token, page=1, total="cached")
+    assert cached.status_code == HTTPStatus.OK
+    assert not statements
+    assert cached.json["items"][0]["name"] == "widget0"
+    assert cached.json["total_items"] == response.json["total_items"]
+    assert cached.headers["Link"] == response.headers["Link"]
+    assert widget_response_cache.hits == 1
+
+    # Conditional requests are answered from the cache too.
+    response = retrieve_widget_list(client, access_token, total="none", fields="name")
+    response = client.get(
+        "/api/v1/widgets?total=none&fields=name",
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "If-None-Match": response.headers["ETag"],
+        },
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert widget_response_cache.hits == 2
+
+    create_widget(client, access_token, widget_name="widget1", deadline_str=DEADLINE)
+    response = retrieve_widget_list(client, access_token, total="cached")
+    assert [item["name"] for item in response.json["items"]] == ["widget0", "widget1"]
+    update_widget(client, access_token, "widget1", "https://www.other.com", DEADLINE)
+    response = retrieve_widget_list(client, access_token, total="cached")
+    assert response.json["items"][1]["info_url"] == "https://www.other.com"
+    delete_widget(client, access_token, "widget1")
+    response = retrieve_widget_list(client, access_token, total="cached")
+    assert response.json["total_items"] == 1
+
+
+def test_widget_list_exact_total_not_cached(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_widget(client, access_token, widget_name="widget0", deadline_str=DEADLINE)
+
+    for _ in range(2):
+        with count_queries(db.engine) as statements:
+            response = retrieve_widget_list(client, access_token, total="exact")
+        assert response.status_code == HTTPStatus.OK
+        assert any("count(" in statement.lower() for statement in statements)
+    assert widget_response_cache.hits == 0
+
+
+def test_widget_response_cache_time_fields(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    deadline = datetime.utcnow() + timedelta(seconds=2)
+    db.session.add(Widget(name="widget0", deadline=deadline, owner=admin))
+    db.session.commit()
+
+    response = retrieve_widget(client, access_token, "widget0")
+    assert response.json["deadline_passed"] is False
+    etag = response.headers["ETag"]
+
+    # Moved into the past, as if the deadline had passed since the first request.
+    snapshot = widget_response_cache.get(("widget", "widget0", None)).widgets[0]
+    snapshot["deadline"] = datetime.utcnow() - timedelta(seconds=1)
+    response = retrieve_widget(client, access_token, "widget0")
+    assert widget_response_cache.hits == 2
+    assert response.json["deadline_passed"] is True
+    assert response.json["time_remaining"] == "No time remaining"
+    assert response.headers["ETag"] != etag
+
+
+def test_widget_response_cache_detail(client, db, admin):
+    access_token = login_user(client, email=ADMIN_EMAIL).json["access_token"]
+    create_widget(client, access_token, widget_name="widget0", deadline_str=DEADLINE)
+
+    response = retrieve_widget(client, access_token, "WIDGET0", fields="name,info_url")
+    assert response.status_code == HTTPStatus.OK
+    response = retrieve_widget(client, access_token, "widget0", fields="info_url,name")
+    assert response.json == {"name": "widget0", "info_url": DEFAULT_URL}
+    assert widget_response_cache.hits == 1
+
+    update_widget(client, access_token, "widget0", "https://www.other.com", DEADLINE)
+    response = retrieve_widget(client, access_token, "widget0", fields="name,info_url")
+    assert response.json["info_url"] == "https://www.other.com"
+
+    response = retrieve_metrics(client, access_token)
+    stats = response.json["widget_response_cache"]
+    assert stats["size"] == 1 and stats["bytes"] > 0
+    assert stats["misses"] == 2 and stats["hits"] == 1
@@ -1,7 +1,11 @@
 """Shared functions and constants for unit tests."""
-from datetime import date
+from contextlib import contextmanager
+from datetime import date, timedelta
 
 from flask import url_for
+from sqlalchemy import event
+
+from flask_api.models.widget import Widget
 
 EMAIL = "new_user@email.com"
 ADMIN_EMAIL = "admin_user@email.com"
@@ -34,6 +38,14 @@ def login_user(test_client, email=EMAIL, password=PASSWORD):
     )
 
 
+def refresh_access_token(test_client, refresh_token):
+    return test_client.post(
+        url_for("api.auth_refresh"),
+        data=f"refresh_token={refresh_token}",
+        content_type="application/x-www-form-urlencoded",
+    )
+
+
 def get_user(test_client, access_token):
     return test_client.get(
         url_for("api.auth_user"), headers={"Authorization": f"Bearer {access_token}"}
@@ -46,6 +58,19 @@ def logout_user(test_client, access_token):
     )
 
 
+def logout_all(test_client, access_token):
+    return test_client.post(
+        url_for("api.auth_logout_all"),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def retrieve_metrics(test_client, access_token):
+    return test_client.get(
+        url_for("api.metrics"), headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+
 # Widget Functions
 
 
@@ -64,16 +89,54 @@ def create_widget(
     )
 
 
-def retrieve_widget_list(test_client, access_token, page=None, per_page=None):
+def retrieve_widget_list(
+    test_client,
+    access_token,
+    page=None,
+    per_page=None,
+    total=None,
+    cursor=None,
+    fields=None,
+):
     return test_client.get(
-        url_for("api.widget_list", page=page, per_page=per_page),
+        url_for(
+            "api.widget_list",
+            page=page,
+            per_page=per_page,
+            total=total,
+            cursor=cursor,
+            fields=fields,
+        ),
         headers={"Authorization": f"Bearer {access_token}"},
     )
 
 
-def retrieve_widget(test_client, access_token, widget_name):
+def batch_widgets(test_client, access_token, operation, **payload):
+    return test_client.post(
+        url_for(f"api.widget_batch_{operation}"),
+        headers={"Authorization": f"Bearer {access_token}"},
+        json=payload,
+    )
+
+
+def export_widgets(test_client, access_token, **params):
     return test_client.get(
-        url_for("api.widget", name=widget_name),
+        url_for("api.widget_export", **params),
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def add_widgets(db, owner, count):
+    """Add count widgets (widget000, widget001, ...) owned by owner to the database."""
+    deadline = date.today() + timedelta(days=3)
+    for i in range(count):
+        db.session.add(Widget(name=f"widget{i:03}", deadline=deadline, owner=owner))
+    db.session.commit()
+
+
+def retrieve_widget(test_client, access_token, widget_name, fields=None):
+    return test_client.get(
+        url_for("api.widget", name=widget_name, fields=fields),
         headers={"Authorization": f"Bearer {access_token}"},
     )
 
@@ -140,3 +203,18 @@ def delete_octocat(test_client, access_token, octocat_name):
         url_for("api.octocat", name=octocat_name),
         headers={"Authorization": f"Bearer {access_token}"},
     )
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements executed on engine inside the with block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)